@@ -5,16 +5,22 @@ Comprehensive SEO analysis with Keywords Everywhere integration
 """
 
 import asyncio
+import heapq
 import json
 import os
+import random
 import re
+import sys
 import time
-import random
-from typing import Dict, List, Optional, Set
-from urllib.parse import urljoin, urlparse
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from copy import deepcopy
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Set, Tuple, Union
+from urllib.parse import urljoin, urlsplit
 import aiohttp
 from datetime import datetime, timezone
-from serpapi import GoogleSearch
+from types import MappingProxyType
 
 # Load environment variables
 try:
@@ -23,88 +29,494 @@ try:
 except ImportError:
     pass  # dotenv not installed, will use os.environ directly
 
-from playwright.async_api import async_playwright
-from bs4 import BeautifulSoup
+# Faster JSON encoding/decoding when orjson is installed
+try:
+    import orjson
+except ImportError:
+    orjson = None  # orjson not installed, will use the json module
+
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree, html as lxml_html
 from mcp.server.fastmcp import FastMCP
 
 # Initialize FastMCP server
 mcp = FastMCP("seo-complete-analysis")
 
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# HTTP client defaults; PageSpeed runs a full Lighthouse audit server-side so it gets a longer budget
+HTTP_TIMEOUT = aiohttp.ClientTimeout(total=30, connect=10)
+PAGESPEED_TIMEOUT = aiohttp.ClientTimeout(total=120, connect=10)
+
+# Navigation waits for DOMContentLoaded, then gives late XHR content this long to settle
+NAVIGATION_TIMEOUT_MS = 30000
+NETWORK_IDLE_TIMEOUT_MS = 5000
+
+# Comprehensive required and recommended fields for major schema types (read-only; tuples keep report order stable)
+# A field is a property name (str) or, for nested properties, a tuple of path parts such as ('address', 'streetAddress')
+SCHEMA_REQUIREMENTS = MappingProxyType({
+    'Article': MappingProxyType({
+        'required': ('headline', 'datePublished', 'author'),
+        'recommended': ('dateModified', 'image', 'publisher', 'mainEntityOfPage'),
+        'features': ('article_rich_results', 'amp_articles', 'top_stories')
+    }),
+    'NewsArticle': MappingProxyType({
+        'required': ('headline', 'datePublished', 'author'),
+        'recommended': ('dateModified', 'image', 'publisher', 'mainEntityOfPage'),
+        'features': ('top_stories', 'article_rich_results')
+    }),
+    'BlogPosting': MappingProxyType({
+        'required': ('headline', 'datePublished', 'author'),
+        'recommended': ('dateModified', 'image', 'publisher'),
+        'features': ('article_rich_results',)
+    }),
+    'Product': MappingProxyType({
+        'required': ('name', 'offers'),
+        'recommended': ('image', 'description', 'brand', 'review', 'aggregateRating'),
+        'features': ('product_rich_results', 'merchant_listings')
+    }),
+    'Recipe': MappingProxyType({
+        'required': ('name', 'recipeIngredient', 'recipeInstructions'),
+        'recommended': ('image', 'author', 'datePublished', 'description', 'nutrition', 'cookTime', 'prepTime'),
+        'features': ('recipe_rich_results', 'recipe_carousel')
+    }),
+    'Event': MappingProxyType({
+        'required': ('name', 'startDate', 'location'),
+        'recommended': ('description', 'image', 'endDate', 'offers', 'performer'),
+        'features': ('event_rich_results',)
+    }),
+    'Organization': MappingProxyType({
+        'required': ('name',),
+        'recommended': ('url', 'logo', 'sameAs', 'contactPoint'),
+        'features': ('knowledge_panel', 'sitelinks_searchbox')
+    }),
+    'LocalBusiness': MappingProxyType({
+        'required': ('name', 'address'),
+        'recommended': ('telephone', 'openingHours', 'image', 'priceRange', 'review'),
+        'features': ('local_business_rich_results', 'knowledge_panel', 'local_pack')
+    }),
+    'Person': MappingProxyType({
+        'required': ('name',),
+        'recommended': ('image', 'jobTitle', 'worksFor', 'sameAs'),
+        'features': ('knowledge_panel', 'person_rich_results')
+    }),
+    'WebSite': MappingProxyType({
+        'required': ('name', 'url'),
+        'recommended': ('potentialAction', 'sameAs'),
+        'features': ('sitelinks_searchbox', 'site_name_rich_results')
+    }),
+    'VideoObject': MappingProxyType({
+        'required': ('name', 'description', 'thumbnailUrl', 'uploadDate'),
+        'recommended': ('duration', 'embedUrl', 'contentUrl'),
+        'features': ('video_rich_results', 'video_carousel')
+    }),
+    'FAQPage': MappingProxyType({
+        'required': ('mainEntity',),
+        'recommended': (),
+        'features': ('faq_rich_results',)
+    }),
+    'HowTo': MappingProxyType({
+        'required': ('name', 'step'),
+        'recommended': ('image', 'totalTime', 'estimatedCost', 'supply', 'tool'),
+        'features': ('how_to_rich_results',)
+    }),
+    'BreadcrumbList': MappingProxyType({
+        'required': ('itemListElement',),
+        'recommended': (),
+        'features': ('breadcrumb_rich_results',)
+    })
+})
+
+# Redirect chain walking
+REDIRECT_STATUSES = frozenset({301, 302, 303, 307, 308})
+MAX_REDIRECT_HOPS = 10
+REDIRECT_TYPES = MappingProxyType({
+    300: 'Multiple Choices',
+    301: 'Moved Permanently',
+    302: 'Found (Temporary)',
+    303: 'See Other',
+    304: 'Not Modified',
+    307: 'Temporary Redirect',
+    308: 'Permanent Redirect'
+})
+
+# Browser pages kept open and reused across scrapes
+PAGE_POOL_SIZE = 5
+
+# Competitor pages scraped at once by analyze_serp_content_alignment; one pooled page each
+COMPETITOR_SCRAPE_CONCURRENCY = PAGE_POOL_SIZE
+
+# Subresources that never affect the extracted HTML; aborting them keeps networkidle short
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media", "stylesheet"})
+
+# Shared read-only fallback for missing nested objects, avoids allocating {} per lookup
+EMPTY_MAPPING = MappingProxyType({})
+
+# Keywords Everywhere accepts at most this many kw[] values per get_keyword_data call
+KE_MAX_KEYWORDS_PER_REQUEST = 100
+KE_MAX_CONCURRENT_REQUESTS = 10
+SERPAPI_MAX_CONCURRENT_REQUESTS = 5
+
+# classify_search_intent_data_bulk accepts at most this many distinct keywords (one paid SerpAPI search each)
+INTENT_BULK_MAX_KEYWORDS = 50
+
+# Process-wide caps so concurrent tool calls together stay within each provider's rate limit
+KE_SEMAPHORE = asyncio.Semaphore(KE_MAX_CONCURRENT_REQUESTS)
+SERPAPI_SEMAPHORE = asyncio.Semaphore(SERPAPI_MAX_CONCURRENT_REQUESTS)
+
+# Transient provider statuses retried with exponential backoff plus jitter
+RETRYABLE_STATUSES = frozenset({429, 503})
+API_MAX_RETRIES = 3
+RETRY_BASE_DELAY = 0.25
+
+# keyword_opportunity_scorer weighting per Keywords Everywhere competition label (unknown: 0.5)
+COMPETITION_MULTIPLIERS = MappingProxyType({"Low": 1.0, "Medium": 0.7, "High": 0.4})
+
+# Competition labels that count as an opportunity in the research and gap tools
+LOW_MEDIUM_COMPETITION = frozenset({"Low", "Medium"})
+
+# keyword_research_analysis keeps only the best-scoring recommended targets
+MAX_RECOMMENDED_TARGETS = 50
+
+# Non-content elements stripped once before text extraction
+BOILERPLATE_TAGS = ("script", "style", "nav", "header", "footer", "aside")
+
+# Block-level elements that start a new paragraph for scrape_seo_data's paragraph_count
+BLOCK_TAGS = frozenset({
+    "address", "article", "blockquote", "dd", "details", "div", "dl", "dt", "figcaption", "figure",
+    "form", "h1", "h2", "h3", "h4", "h5", "h6", "hr", "li", "main", "ol", "p", "pre", "section",
+    "summary", "table", "tr", "ul"
+})
+
+# No extractor reads comments or processing instructions, so they're dropped at parse time
+HTML_PARSER_OPTIONS = MappingProxyType({'remove_comments': True, 'remove_pis': True})
+
+# Page HTML is re-encoded as UTF-8 before parsing, so don't trust <meta charset>
+HTML_PARSER = lxml_html.HTMLParser(encoding='utf-8', **HTML_PARSER_OPTIONS)
+
+# The only tags the soup-based extractors (title, links, base href) look at
+SOUP_TAGS = ("title", "base", "a")
+BASE_HREF_SELECTOR = 'base[href]'
+
+# Compiled once; rel matching is per space-separated token, like bs4's rel='...'
+LINK_REL_XPATH = "//link[contains(concat(' ', normalize-space(@rel), ' '), ' {} ')]"
+CANONICAL_XPATH = etree.XPath(LINK_REL_XPATH.format('canonical'))
+ALTERNATE_XPATH = etree.XPath(LINK_REL_XPATH.format('alternate'))
+HEADINGS_XPATH = etree.XPath('//h1|//h2|//h3|//h4|//h5|//h6')
+# Plain str results: orjson rejects lxml's smart-string subclass
+JSON_LD_XPATH = etree.XPath("//script[@type='application/ld+json']/text()", smart_strings=False)
+
+# Precompiled patterns used on the scrape hot path
+MAIN_CONTENT_RE = re.compile(r'content|main|post|article', re.I)
+# Every main-content candidate in one traversal; priority is applied afterwards
+MAIN_CONTENT_XPATH = etree.XPath(
+    "//main | //article"
+    " | //div[re:test(@class, 'content|main|post|article', 'i') or re:test(@id, 'content|main|post|article', 'i')]",
+    namespaces={'re': 'http://exslt.org/regular-expressions'}
+)
+NUMBERED_LIST_RE = re.compile(r'\d+\.')
+BULLET_RE = re.compile(r'[•*]')
+# Case-insensitive search instead of lowercasing a copy of the whole content
+STEP_BY_STEP_RE = re.compile(r'step 1|first step|step by step', re.I)
+
+# Organic-result intent signals for classify_search_intent_data; one substring search per signal
+URL_SHOP_PATH_RE = re.compile(r'/(?:shop|store|buy)')
+URL_BLOG_PATH_RE = re.compile(r'/(?:blog|articles|news)')
+URL_HOW_TO_RE = re.compile(r'how-to|guide|tutorial')
+ECOMMERCE_DOMAIN_RE = re.compile(r'amazon|ebay|etsy|shopify')
+INFORMATIONAL_DOMAIN_RE = re.compile(r'wikipedia|britannica|howstuffworks')
+
+# Title/snippet intent signals: term -> signal. Each text is scanned once with a zero-width
+# lookahead so overlapping terms are all reported (no term may be a prefix of another)
+TITLE_SIGNAL_TERMS = MappingProxyType({
+    'how to': 'title_has_how_to', 'guide': 'title_has_how_to', 'tutorial': 'title_has_how_to',
+    'best': 'title_has_best', 'top': 'title_has_best', 'review': 'title_has_best',
+    'buy': 'title_has_buy', 'price': 'title_has_buy', 'cost': 'title_has_buy',
+    'what is': 'title_has_what_is', 'definition': 'title_has_what_is'
+})
+SNIPPET_SIGNAL_TERMS = MappingProxyType({
+    'step': 'snippet_has_steps', 'follow': 'snippet_has_steps',
+    'price': 'snippet_has_price', 'cost': 'snippet_has_price', '$': 'snippet_has_price'
+})
+TITLE_SIGNAL_RE = re.compile('(?=(' + '|'.join(map(re.escape, TITLE_SIGNAL_TERMS)) + '))')
+SNIPPET_SIGNAL_RE = re.compile('(?=(' + '|'.join(map(re.escape, SNIPPET_SIGNAL_TERMS)) + '))')
+CONTENT_SIGNALS = tuple(dict.fromkeys([*TITLE_SIGNAL_TERMS.values(), *SNIPPET_SIGNAL_TERMS.values()]))
+
+# Answer-box types that define or translate the query; exact matches, so e.g. 'redefinition' doesn't count
+INFORMATIONAL_ANSWER_BOX_TYPES = frozenset({'definition', 'dictionary_results', 'translation_result'})
+
+# SERP feature tables for collect_serp_features: (SerpAPI key, feature name, extractor, fallback when absent)
+INTENT_SERP_FEATURES = (
+    ('answer_box', 'featured_snippet', lambda box: {
+        'present': True,
+        'type': box.get('type', ''),
+        'content_type': 'informational' if box.get('type', '') in INFORMATIONAL_ANSWER_BOX_TYPES else 'answer',
+        'source_domain': url_hostname(box.get('link', ''))
+    }, None),
+    ('people_also_ask', 'people_also_ask', lambda paa: {
+        'present': True,
+        'question_count': len(paa),
+        'questions': [q.get('question', '') for q in paa[:8]]
+    }, None),
+    ('shopping_results', 'shopping_results', lambda shopping: {
+        'present': True,
+        'product_count': len(shopping),
+        'intent_signal': 'commercial/transactional'
+    }, None),
+    ('local_results', 'local_results', lambda local: {
+        'present': True,
+        'business_count': len(local),
+        'intent_signal': 'local'
+    }, None),
+    ('knowledge_graph', 'knowledge_graph', lambda graph: {
+        'present': True,
+        'type': graph.get('type', ''),
+        'intent_signal': 'informational'
+    }, None),
+    ('images_results', 'images', lambda images: {'present': True, 'count': len(images)}, None),
+    ('videos', 'videos', lambda videos: {'present': True, 'count': len(videos)}, None),
+    ('top_stories', 'top_stories', lambda stories: {
+        'present': True,
+        'story_count': len(stories),
+        'intent_signal': 'informational/news'
+    }, None)
+)
+MISSING_FEATURE_OPPORTUNITY = MappingProxyType({'present': False, 'opportunity': True})
+OPPORTUNITY_SERP_FEATURES = (
+    ('answer_box', 'featured_snippet', lambda box: {
+        'present': True,
+        'type': box.get('type', ''),
+        'current_winner': box.get('link', ''),
+        'content_length': len(box.get('snippet', '')),
+        'content_format': 'paragraph' if box.get('type', '') == 'paragraph' else 'list'
+    }, MISSING_FEATURE_OPPORTUNITY),
+    ('people_also_ask', 'people_also_ask', lambda paa: {
+        'present': True,
+        'question_count': len(paa),
+        'questions': [q.get('question', '') for q in paa[:5]]
+    }, MISSING_FEATURE_OPPORTUNITY),
+    ('knowledge_graph', 'knowledge_graph', lambda graph: {
+        'present': True,
+        'type': graph.get('type', ''),
+        'current_winner': graph.get('source', {}).get('link', '')
+    }, None),
+    ('shopping_results', 'shopping_results', lambda shopping: {'present': True, 'product_count': len(shopping)}, None),
+    ('images_results', 'images', lambda images: {'present': True, 'image_count': len(images)}, None),
+    ('videos', 'videos', lambda videos: {'present': True, 'video_count': len(videos)}, None)
+)
+
+def create_http_session() -> aiohttp.ClientSession:
+    """Keep-alive session with DNS caching and per-host limits, shared by all HTTP probes"""
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit=200,
+            # Above KE_MAX_CONCURRENT_REQUESTS so bulk keyword batches aren't queued behind the pool
+            limit_per_host=20,
+            use_dns_cache=True,
+            ttl_dns_cache=600,
+            keepalive_timeout=75
+        ),
+        timeout=HTTP_TIMEOUT,
+        headers={'User-Agent': USER_AGENT}
+    )
+
+def utc_timestamp() -> str:
+    """Current time as an unambiguous ISO 8601 UTC timestamp"""
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+def normalize_whitespace(text: str) -> str:
+    """Collapse runs of whitespace to single spaces and trim (str.split/join run in C)"""
+    return ' '.join(text.split())
+
+def dump_json(data: Any, pretty: bool = True) -> str:
+    """Encode tool output as non-ASCII-preserving JSON, indented unless pretty=False; orjson when available"""
+    if orjson is not None:
+        try:
+            option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if pretty else 0)
+            return orjson.dumps(data, option=option).decode()
+        except TypeError:
+            pass  # e.g. integers wider than 64 bits; the json module handles those
+    if pretty:
+        return json.dumps(data, indent=2, ensure_ascii=False)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+def url_hostname(url: str) -> str:
+    """Lowercased host of a URL without port or credentials; '' when missing or unparseable"""
+    try:
+        return urlsplit(url).hostname or ''
+    except ValueError:
+        return ''  # e.g. an unterminated IPv6 literal
+
+def collect_serp_features(results: Dict, spec: Tuple) -> Dict:
+    """Summarize SERP features from a table of (key, name, extractor, fallback); one lookup per feature"""
+    features = {}
+    for result_key, feature_name, extract, fallback in spec:
+        value = results.get(result_key)
+        if value is not None:
+            features[feature_name] = extract(value)
+        elif fallback is not None:
+            features[feature_name] = dict(fallback)
+    return features
+
+def backoff_delay(attempt: int) -> float:
+    """Seconds to wait before retry number attempt + 1, jittered so parallel callers don't resync"""
+    return RETRY_BASE_DELAY * 2 ** attempt + random.uniform(0, 0.1)
+
+def load_json(text: str):
+    """Decode JSON with orjson when available; errors are json.JSONDecodeError either way"""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+class ResponseCache:
+    """In-process LRU cache with an optional TTL for idempotent API responses"""
+    
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()  # key -> (stored_at, value)
+    
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None when missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, value = entry
+        if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+    
+    def set(self, key: Hashable, value: Any):
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+    
+    def clear(self):
+        self._entries.clear()
+
+# Keyword metrics change monthly; SERPs drift within hours; PageSpeed results go stale quickly
+KE_RESPONSE_CACHE = ResponseCache(maxsize=1024, ttl=6 * 3600)
+SERPAPI_CACHE = ResponseCache(maxsize=512, ttl=3600)
+PAGESPEED_CACHE = ResponseCache(maxsize=256, ttl=15 * 60)
+
 class KeywordsEverywhereAPI:
     """Keywords Everywhere API client integrated into SEO MCP"""
     
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, session_provider: Optional[Callable[[], Awaitable[aiohttp.ClientSession]]] = None):
         self.api_key = api_key or os.getenv('KEYWORDS_EVERYWHERE_API_KEY')
         self.base_url = "https://api.keywordseverywhere.com/v1"
         self.headers = {
             "Accept": "application/json",
             "Authorization": f"Bearer {self.api_key}"
         }
+        # Shared session provider (e.g. SEOScraperComplete.get_session) so KE calls reuse the scraper's pool
+        self._session_provider = session_provider
+        self._session: Optional[aiohttp.ClientSession] = None
     
-    async def get_search_volume(self, keywords: List[str], country: str = "US") -> Dict:
-        """Get search volume data for keywords - FIXED API format"""
-        async with aiohttp.ClientSession() as session:
-            # FIXED: Use correct parameter format from official documentation
-            data = {
-                'country': country.lower(),
-                'currency': 'usd',
-                'dataSource': 'gkp',
-                'kw[]': keywords  # FIXED: This was the main issue - API expects kw[] not keywords
-            }
-            
-            async with session.post(
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return a keep-alive session, created lazily on first use"""
+        if self._session_provider is not None:
+            return await self._session_provider()
+        if self._session is None or self._session.closed:
+            self._session = create_http_session()
+        return self._session
+    
+    async def close(self):
+        """Close the session if this client owns it"""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    async def _post_keyword_data(self, data: Dict) -> Dict:
+        """POST to get_keyword_data under KE_SEMAPHORE, retrying rate-limit responses with backoff"""
+        session = await self._get_session()
+        for attempt in range(API_MAX_RETRIES + 1):
+            async with KE_SEMAPHORE, session.post(
                 f"{self.base_url}/get_keyword_data",
                 headers=self.headers,
                 data=data  # FIXED: Use 'data' instead of 'json' for form data
             ) as response:
                 if response.status == 200:
                     return await response.json()
-                else:
+                if response.status not in RETRYABLE_STATUSES or attempt == API_MAX_RETRIES:
                     error_text = await response.text()
                     raise Exception(f"Keywords Everywhere API error: {response.status} - {error_text}")
+            await asyncio.sleep(backoff_delay(attempt))
+    
+    async def get_search_volume(self, keywords: List[str], country: str = "US") -> Dict:
+        """Get search volume data for keywords - FIXED API format"""
+        cache_key = (self.api_key, country.lower(), tuple(keywords))
+        cached = KE_RESPONSE_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        # FIXED: Use correct parameter format from official documentation
+        data = {
+            'country': country.lower(),
+            'currency': 'usd',
+            'dataSource': 'gkp',
+            'kw[]': keywords  # FIXED: This was the main issue - API expects kw[] not keywords
+        }
+        
+        result = await self._post_keyword_data(data)
+        KE_RESPONSE_CACHE.set(cache_key, result)
+        return result
+    
+    async def get_search_volume_bulk(self, keywords: List[str], country: str = "US", chunk_size: int = KE_MAX_KEYWORDS_PER_REQUEST, concurrency: int = KE_MAX_CONCURRENT_REQUESTS) -> Dict:
+        """Get search volume for any number of keywords as concurrent chunked requests, merged into one 'data' list"""
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def fetch_chunk(chunk: List[str]) -> Dict:
+            async with semaphore:
+                return await self.get_search_volume(chunk, country)
+        
+        chunks = [keywords[i:i + chunk_size] for i in range(0, len(keywords), chunk_size)]
+        results = await asyncio.gather(*[fetch_chunk(chunk) for chunk in chunks])
+        return {'data': [row for result in results for row in result.get('data', [])]}
     
     async def get_related_keywords(self, keyword: str, country: str = "US") -> Dict:
         """Get related keywords using bulk keyword discovery approach - FIXED for actual API"""
-        async with aiohttp.ClientSession() as session:
-            # FIXED: Use the working get_keyword_data endpoint approach to simulate related keywords
-            # Generate related keyword variations for the seed keyword
-            related_variants = [
-                f"{keyword} tips",
-                f"{keyword} guide", 
-                f"{keyword} tutorial",
-                f"{keyword} examples",
-                f"{keyword} tools",
-                f"how to {keyword}",
-                f"best {keyword}",
-                f"{keyword} strategies",
-                f"{keyword} techniques",
-                f"{keyword} benefits"
-            ]
-            
-            # Use the working get_keyword_data endpoint format
-            data = {
-                'country': country.lower(),
-                'currency': 'usd',  
-                'dataSource': 'gkp',
-                'kw[]': related_variants  # Use working format from get_keyword_data
-            }
-            
-            async with session.post(
-                f"{self.base_url}/get_keyword_data",  # Use working endpoint
-                headers=self.headers,
-                data=data
-            ) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    # Format response to match expected structure
-                    return {
-                        'seed_keyword': keyword,
-                        'data': result.get('data', []),
-                        'total_count': len(result.get('data', []))
-                    }
-                else:
-                    error_text = await response.text()
-                    raise Exception(f"Keywords Everywhere API error: {response.status} - {error_text}")
+        cache_key = (self.api_key, country.lower(), 'related', keyword)
+        cached = KE_RESPONSE_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        # FIXED: Use the working get_keyword_data endpoint approach to simulate related keywords
+        # Generate related keyword variations for the seed keyword
+        related_variants = [
+            f"{keyword} tips",
+            f"{keyword} guide", 
+            f"{keyword} tutorial",
+            f"{keyword} examples",
+            f"{keyword} tools",
+            f"how to {keyword}",
+            f"best {keyword}",
+            f"{keyword} strategies",
+            f"{keyword} techniques",
+            f"{keyword} benefits"
+        ]
+        
+        # Use the working get_keyword_data endpoint format
+        data = {
+            'country': country.lower(),
+            'currency': 'usd',  
+            'dataSource': 'gkp',
+            'kw[]': related_variants  # Use working format from get_keyword_data
+        }
+        
+        result = await self._post_keyword_data(data)  # Use working endpoint
+        # Format response to match expected structure
+        related = {
+            'seed_keyword': keyword,
+            'data': result.get('data', []),
+            'total_count': len(result.get('data', []))
+        }
+        KE_RESPONSE_CACHE.set(cache_key, related)
+        return related
     
     async def test_api_connection(self) -> Dict:
         """Test Keywords Everywhere API connection and key validity"""
@@ -114,10 +526,15 @@ class KeywordsEverywhereAPI:
                 'message': 'API key not found. Please set KEYWORDS_EVERYWHERE_API_KEY environment variable.'
             }
         
-        # Test with a simple keyword query
+        # Test with a simple keyword query, always sent to the API (never KE_RESPONSE_CACHE)
+        # so a revoked key or exhausted quota shows up immediately
         try:
-            test_keywords = ['test']
-            data = await self.get_search_volume(test_keywords, 'US')
+            data = await self._post_keyword_data({
+                'country': 'us',
+                'currency': 'usd',
+                'dataSource': 'gkp',
+                'kw[]': ['test']
+            })
             return {
                 'status': 'success',
                 'message': 'API connection successful',
@@ -136,21 +553,54 @@ class SEOScraperComplete:
         self.browser = None
         self.context = None
         self.session = None
-        self.ke_api = KeywordsEverywhereAPI()
+        self.ke_api = KeywordsEverywhereAPI(session_provider=self.get_session)
+        self._page_pool: Optional[asyncio.Queue] = None
+        self._browser_lock = asyncio.Lock()
     
     async def start_browser(self):
-        """Initialize browser context"""
-        if not self.browser:
-            self.playwright = await async_playwright().start()
-            self.browser = await self.playwright.chromium.launch(headless=True)
-            self.context = await self.browser.new_context(
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-            )
+        """Initialize browser context and the pool of reusable pages"""
+        async with self._browser_lock:
+            if not self.browser:
+                self.playwright = await async_playwright().start()
+                self.browser = await self.playwright.chromium.launch(headless=True)
+                self.context = await self.browser.new_context(
+                    user_agent=USER_AGENT
+                )
+                await self.context.route("**/*", self._block_heavy_resources)
+                self._page_pool = asyncio.Queue()
+                for _ in range(PAGE_POOL_SIZE):
+                    self._page_pool.put_nowait(await self.context.new_page())
+    
+    @staticmethod
+    async def _block_heavy_resources(route):
+        """Route handler that aborts image/font/media/stylesheet requests"""
+        if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        else:
+            await route.continue_()
     
-    async def start_session(self):
-        """Initialize aiohttp session"""
-        if not self.session:
-            self.session = aiohttp.ClientSession()
+    @asynccontextmanager
+    async def _lease_page(self):
+        """Borrow a pooled page; it is reset to about:blank before going back to the pool"""
+        await self.start_browser()
+        page = await self._page_pool.get()
+        try:
+            yield page
+        finally:
+            try:
+                await page.goto('about:blank')
+            except Exception:
+                # Crashed or closed page - replace it so the pool keeps its size
+                if not page.is_closed():
+                    await page.close()
+                page = await self.context.new_page()
+            self._page_pool.put_nowait(page)
+    
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Shared session for every HTTP call, created on first use and closed in close_resources"""
+        if not self.session or self.session.closed:
+            self.session = create_http_session()
+        return self.session
     
     async def close_resources(self):
         """Clean up all resources"""
@@ -160,86 +610,151 @@ class SEOScraperComplete:
             await self.browser.close()
         if hasattr(self, 'playwright'):
             await self.playwright.stop()
+        self.browser = None
+        self.context = None
+        self._page_pool = None
         if self.session:
             await self.session.close()
+            self.session = None
+        await self.ke_api.close()
     
     async def scrape_seo_data(self, url: str) -> Dict:
         """Extract comprehensive SEO data - SIMPLIFIED for Claude analysis"""
         try:
-            await self.start_browser()
-            page = await self.context.new_page()
-            await page.goto(url, wait_until="networkidle", timeout=30000)
-            html_content = await page.content()
-            soup = BeautifulSoup(html_content, 'lxml')
+            html_content = await self.render_html(url)
+            soup, root, content_root = self._parse_page(html_content)
+            full_text = self.extract_full_text(content_root)
+            main_element = self._main_content_element(content_root)
+            meta = self._collect_meta(root)
+            internal_links, external_links = self._collect_links(soup, url)
             
             # Extract raw data for Claude to analyze
             seo_data = {
                 'url': url,
-                'extraction_date': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'extraction_date': utc_timestamp(),
                 
                 # Basic SEO elements
                 'title': self.extract_title(soup),
-                'meta_tags': self.extract_meta_tags(soup),
-                'headers': self.extract_headers(soup),
-                'canonical_url': self.extract_canonical(soup),
-                'robots_meta': self.extract_robots_meta(soup),
-                'meta_viewport': self.extract_meta_viewport(soup),
+                'meta_tags': self.extract_meta_tags(meta),
+                'headers': self.extract_headers(root),
+                'canonical_url': self.extract_canonical(root),
+                'robots_meta': self.extract_robots_meta(meta),
+                'meta_viewport': self.extract_meta_viewport(meta),
                 
                 # Content data (raw for Claude analysis)
-                'main_content': self.extract_main_content(soup),
-                'full_text': self.extract_full_text(soup),
-                'word_count': self.get_word_count(soup),
+                'main_content': self._element_text(main_element),
+                'full_text': full_text,
+                'word_count': self.get_word_count(full_text),
+                'has_table': root.find('.//table') is not None,
+                'paragraph_count': self._paragraph_count(main_element),
                 
                 # Link data
-                'internal_links': self.extract_internal_links(soup, url),
-                'external_links': self.extract_external_links(soup, url),
+                'internal_links': internal_links,
+                'external_links': external_links,
                 
                 # Structured data
-                'schema_markup': self.extract_schema_markup(soup),
-                'open_graph': self.extract_open_graph(soup),
-                'twitter_cards': self.extract_twitter_cards(soup),
+                'schema_markup': self.extract_schema_markup(root),
+                'open_graph': self.extract_open_graph(meta),
+                'twitter_cards': self.extract_twitter_cards(meta),
                 
                 # Technical elements
-                'hreflang': self.extract_hreflang(soup),
-                'meta_refresh': self.extract_meta_refresh(soup),
+                'hreflang': self.extract_hreflang(root),
+                'meta_refresh': self.extract_meta_refresh(meta),
                 'base_href': self.extract_base_href(soup)
             }
             
-            await page.close()
             return seo_data
         except Exception as e:
             return {'error': f"Error scraping {url}: {str(e)}"}
     
-    def extract_main_content(self, soup: BeautifulSoup) -> str:
-        """Extract main content text for Claude analysis"""
-        # Remove non-content elements
-        for element in soup(["script", "style", "nav", "header", "footer", "aside"]):
-            element.decompose()
-        
-        # Try to find main content area
-        main_content = (soup.find('main') or 
-                       soup.find('article') or 
-                       soup.find('div', class_=re.compile(r'content|main|post|article', re.I)) or
-                       soup.find('div', id=re.compile(r'content|main|post|article', re.I)))
-        
-        if main_content:
-            return main_content.get_text(separator=' ', strip=True)
-        else:
-            # Fallback to body content
-            body = soup.find('body')
-            if body:
-                return body.get_text(separator=' ', strip=True)
-            return soup.get_text(separator=' ', strip=True)
-    
-    def extract_full_text(self, soup: BeautifulSoup) -> str:
-        """Extract all visible text for comprehensive analysis"""
-        # Remove scripts and styles but keep other content
-        for script in soup(["script", "style"]):
-            script.decompose()
-        return soup.get_text(separator=' ', strip=True)
+    async def render_html(self, url: str) -> bytes:
+        """Page HTML after the browser has run its JavaScript, as UTF-8 bytes, on a pooled page"""
+        async with self._lease_page() as page:
+            await self._load_page(page, url)
+            # Encode once so the parsers get bytes without re-detecting the encoding
+            return (await page.content()).encode('utf-8')
+    
+    async def fetch_tree(self, url: str) -> lxml_html.HtmlElement:
+        """Render a page and parse it into a full lxml document tree"""
+        return self._parse_tree(await self.render_html(url))
+    
+    async def _load_page(self, page, url: str):
+        """Navigate to DOMContentLoaded, then wait for network idle on a best-effort basis"""
+        await page.goto(url, wait_until="domcontentloaded", timeout=NAVIGATION_TIMEOUT_MS)
+        try:
+            await page.wait_for_load_state("networkidle", timeout=NETWORK_IDLE_TIMEOUT_MS)
+        except PlaywrightTimeoutError:
+            pass  # Long-polling/analytics requests shouldn't block extraction
+    
+    def _parse_tree(self, html: bytes) -> lxml_html.HtmlElement:
+        """Parse UTF-8 HTML into a full lxml document tree"""
+        return lxml_html.document_fromstring(html, parser=HTML_PARSER)
+    
+    def _parse_page(self, html: bytes) -> Tuple[BeautifulSoup, lxml_html.HtmlElement, lxml_html.HtmlElement]:
+        """Parse UTF-8 HTML into (strained soup, raw lxml tree, lxml tree stripped of BOILERPLATE_TAGS)
+        
+        Boilerplate is removed once on a copy of the tree, so extractors never mutate
+        the soup or raw tree and their call order in scrape_seo_data doesn't affect results.
+        The soup only holds the SOUP_TAGS its remaining extractors read.
+        """
+        soup = BeautifulSoup(html, 'lxml', from_encoding='utf-8', parse_only=SoupStrainer(SOUP_TAGS))
+        root = self._parse_tree(html)
+        content_root = deepcopy(root)
+        etree.strip_elements(content_root, *BOILERPLATE_TAGS, with_tail=False)
+        return soup, root, content_root
+    
+    @staticmethod
+    def _element_text(element) -> str:
+        """Whitespace-normalized text of an lxml element, one space between text nodes"""
+        # itertext() rather than text_content() so adjacent blocks don't run together
+        return normalize_whitespace(' '.join(element.itertext()))
+    
+    @staticmethod
+    def _paragraph_count(element) -> int:
+        """Number of non-empty text blocks in an lxml element, each block-level element starting a new one"""
+        count = 0
+        has_text = False
+        for event, node in etree.iterwalk(element, events=('start', 'end')):
+            is_element = isinstance(node.tag, str)
+            if is_element and node.tag in BLOCK_TAGS:
+                count += has_text
+                has_text = False
+            if event == 'start':
+                text = node.text if is_element else None
+            else:
+                text = node.tail if node is not element else None
+            if text and not text.isspace():
+                has_text = True
+        return count + has_text
+    
+    def _main_content_element(self, root: lxml_html.HtmlElement) -> lxml_html.HtmlElement:
+        """Main content area: <main>, then <article>, then a div by class, then by id, else <body> (expects the cleaned tree)"""
+        candidates = MAIN_CONTENT_XPATH(root)
+        if candidates:
+            return min(candidates, key=self._main_content_priority)
+        # Fallback to body content
+        body = root.find('body')
+        return body if body is not None else root
+    
+    def extract_main_content(self, root: lxml_html.HtmlElement) -> str:
+        """Extract main content text for Claude analysis (expects the cleaned tree from _parse_page)"""
+        return self._element_text(self._main_content_element(root))
+    
+    @staticmethod
+    def _main_content_priority(element) -> int:
+        """Rank of a MAIN_CONTENT_XPATH match; min() keeps document order within a rank"""
+        if element.tag == 'main':
+            return 0
+        if element.tag == 'article':
+            return 1
+        return 2 if MAIN_CONTENT_RE.search(element.get('class', '')) else 3
+    
+    def extract_full_text(self, root: lxml_html.HtmlElement) -> str:
+        """Extract all visible text for comprehensive analysis (expects the cleaned tree)"""
+        return self._element_text(root)
     
     # FIXED: Enhanced structured data validation
-    def validate_structured_data_enhanced(self, soup: BeautifulSoup) -> Dict:
+    def validate_structured_data_enhanced(self, root: lxml_html.HtmlElement) -> Dict:
         """Enhanced structured data validation with comprehensive Schema.org checking"""
         validation_data = {
             'json_ld': [],
@@ -251,9 +766,9 @@ class SEOScraperComplete:
         }
         
         # Extract and validate JSON-LD
-        for script in soup.find_all('script', type='application/ld+json'):
+        for script_text in JSON_LD_XPATH(root):
             try:
-                json_data = json.loads(script.string)
+                json_data = load_json(script_text)
                 validation_data['json_ld'].append(json_data)
                 
                 # Handle both single objects and graphs
@@ -282,15 +797,15 @@ class SEOScraperComplete:
                 validation_data['validation_errors'].append(f"Invalid JSON-LD: {str(e)}")
         
         # Extract microdata
-        for item in soup.find_all(attrs={'itemtype': True}):
+        for item in root.xpath('//*[@itemtype]'):
             microdata_item = {
                 'itemtype': item.get('itemtype'),
                 'properties': {}
             }
             
-            for prop in item.find_all(attrs={'itemprop': True}):
+            for prop in item.xpath('.//*[@itemprop]'):
                 prop_name = prop.get('itemprop')
-                prop_value = prop.get('content') or prop.get_text().strip()
+                prop_value = prop.get('content') or prop.text_content().strip()
                 microdata_item['properties'][prop_name] = prop_value
             
             validation_data['microdata'].append(microdata_item)
@@ -298,19 +813,19 @@ class SEOScraperComplete:
             # Check rich results for microdata
             itemtype = item.get('itemtype', '')
             if itemtype:
-                schema_type = itemtype.split('/')[-1]  # Extract type from URL
+                schema_type = itemtype.rpartition('/')[2]  # Extract type from URL
                 validation_data['rich_results_eligibility'][f"microdata_{schema_type}"] = self.check_microdata_rich_results(microdata_item)
         
         # Extract RDFa
-        for item in soup.find_all(attrs={'typeof': True}):
+        for item in root.xpath('//*[@typeof]'):
             rdfa_item = {
                 'typeof': item.get('typeof'),
                 'properties': {}
             }
             
-            for prop in item.find_all(attrs={'property': True}):
+            for prop in item.xpath('.//*[@property]'):
                 prop_name = prop.get('property')
-                prop_value = prop.get('content') or prop.get_text().strip()
+                prop_value = prop.get('content') or prop.text_content().strip()
                 rdfa_item['properties'][prop_name] = prop_value
             
             validation_data['rdfa'].append(rdfa_item)
@@ -328,98 +843,16 @@ class SEOScraperComplete:
             'validation_score': 0
         }
         
-        # Comprehensive required and recommended fields for major schema types
-        schema_requirements = {
-            'Article': {
-                'required': ['headline', 'datePublished', 'author'],
-                'recommended': ['dateModified', 'image', 'publisher', 'mainEntityOfPage'],
-                'features': ['article_rich_results', 'amp_articles', 'top_stories']
-            },
-            'NewsArticle': {
-                'required': ['headline', 'datePublished', 'author'],
-                'recommended': ['dateModified', 'image', 'publisher', 'mainEntityOfPage'],
-                'features': ['top_stories', 'article_rich_results']
-            },
-            'BlogPosting': {
-                'required': ['headline', 'datePublished', 'author'],
-                'recommended': ['dateModified', 'image', 'publisher'],
-                'features': ['article_rich_results']
-            },
-            'Product': {
-                'required': ['name', 'offers'],
-                'recommended': ['image', 'description', 'brand', 'review', 'aggregateRating'],
-                'features': ['product_rich_results', 'merchant_listings']
-            },
-            'Recipe': {
-                'required': ['name', 'recipeIngredient', 'recipeInstructions'],
-                'recommended': ['image', 'author', 'datePublished', 'description', 'nutrition', 'cookTime', 'prepTime'],
-                'features': ['recipe_rich_results', 'recipe_carousel']
-            },
-            'Event': {
-                'required': ['name', 'startDate', 'location'],
-                'recommended': ['description', 'image', 'endDate', 'offers', 'performer'],
-                'features': ['event_rich_results']
-            },
-            'Organization': {
-                'required': ['name'],
-                'recommended': ['url', 'logo', 'sameAs', 'contactPoint'],
-                'features': ['knowledge_panel', 'sitelinks_searchbox']
-            },
-            'LocalBusiness': {
-                'required': ['name', 'address'],
-                'recommended': ['telephone', 'openingHours', 'image', 'priceRange', 'review'],
-                'features': ['local_business_rich_results', 'knowledge_panel', 'local_pack']
-            },
-            'Person': {
-                'required': ['name'],
-                'recommended': ['image', 'jobTitle', 'worksFor', 'sameAs'],
-                'features': ['knowledge_panel', 'person_rich_results']
-            },
-            'WebSite': {
-                'required': ['name', 'url'],
-                'recommended': ['potentialAction', 'sameAs'],
-                'features': ['sitelinks_searchbox', 'site_name_rich_results']
-            },
-            'VideoObject': {
-                'required': ['name', 'description', 'thumbnailUrl', 'uploadDate'],
-                'recommended': ['duration', 'embedUrl', 'contentUrl'],
-                'features': ['video_rich_results', 'video_carousel']
-            },
-            'FAQPage': {
-                'required': ['mainEntity'],
-                'recommended': [],
-                'features': ['faq_rich_results']
-            },
-            'HowTo': {
-                'required': ['name', 'step'],
-                'recommended': ['image', 'totalTime', 'estimatedCost', 'supply', 'tool'],
-                'features': ['how_to_rich_results']
-            },
-            'BreadcrumbList': {
-                'required': ['itemListElement'],
-                'recommended': [],
-                'features': ['breadcrumb_rich_results']
-            }
-        }
-        
-        if schema_type not in schema_requirements:
+        if schema_type not in SCHEMA_REQUIREMENTS:
             eligibility['validation_score'] = 0
             eligibility['missing_required_fields'] = ['Unknown schema type']
             return eligibility
         
-        requirements = schema_requirements[schema_type]
+        requirements = SCHEMA_REQUIREMENTS[schema_type]
         
-        # Check required fields
-        missing_required = []
-        for field in requirements['required']:
-            if not self._check_field_exists(data, field):
-                missing_required.append(field)
-        
-        # Check recommended fields
-        missing_recommended = []
-        for field in requirements['recommended']:
-            if not self._check_field_exists(data, field):
-                missing_recommended.append(field)
+        # Check required and recommended fields
+        missing_required = [self._field_name(field) for field in requirements['required'] if not self._check_field_exists(data, field)]
+        missing_recommended = [self._field_name(field) for field in requirements['recommended'] if not self._check_field_exists(data, field)]
         
         # Calculate eligibility
         eligibility['missing_required_fields'] = missing_required
@@ -429,7 +862,7 @@ class SEOScraperComplete:
         
         # Add potential features
         if eligibility['eligible']:
-            eligibility['rich_result_features'] = requirements['features']
+            eligibility['rich_result_features'] = list(requirements['features'])
         
         # Calculate validation score (0-100)
         total_fields = len(requirements['required']) + len(requirements['recommended'])
@@ -441,21 +874,27 @@ class SEOScraperComplete:
         
         return eligibility
     
-    def _check_field_exists(self, data: Dict, field_path: str) -> bool:
-        """Check if a nested field exists in the data"""
-        if '.' in field_path:
-            # Handle nested fields like 'address.streetAddress'
-            parts = field_path.split('.')
-            current = data
-            for part in parts:
-                if isinstance(current, dict) and part in current:
-                    current = current[part]
-                else:
-                    return False
-            return current is not None and current != ''
-        else:
-            # Handle direct fields
-            return field_path in data and data[field_path] is not None and data[field_path] != ''
+    def _check_field_exists(self, data: Dict, field: Union[str, Tuple[str, ...]]) -> bool:
+        """Check if a SCHEMA_REQUIREMENTS field exists in the data; tuple fields walk nested objects"""
+        if isinstance(field, str):
+            return data.get(field) not in (None, '')
+        return self._check_nested_field_exists(data, field)
+    
+    @staticmethod
+    def _field_name(field: Union[str, Tuple[str, ...]]) -> str:
+        """Report name of a SCHEMA_REQUIREMENTS field, dotted for nested paths"""
+        return field if isinstance(field, str) else '.'.join(field)
+    
+    @staticmethod
+    def _check_nested_field_exists(data: Dict, parts: Tuple[str, ...]) -> bool:
+        """Walk a field path's parts through nested dicts"""
+        current = data
+        for part in parts:
+            if isinstance(current, dict) and part in current:
+                current = current[part]
+            else:
+                return False
+        return current is not None and current != ''
     
     def _get_schema_recommendations(self, schema_type: str, missing_required: List[str], missing_recommended: List[str]) -> List[str]:
         """Get specific recommendations for schema improvement"""
@@ -487,10 +926,40 @@ class SEOScraperComplete:
             'recommendation': 'Consider migrating to JSON-LD for better support'
         }
     
+    async def serpapi_search(self, params: Dict) -> Dict:
+        """Run a SerpAPI search on the shared session without blocking the event loop
+        
+        Returns the decoded JSON as-is, so API failures surface as an 'error' key
+        exactly like GoogleSearch.get_dict() did. Successful responses are cached per
+        query (ignoring the API key), so chained tools on one keyword share a search.
+        Searches run under SERPAPI_SEMAPHORE and 429/503 responses are retried with backoff.
+        """
+        cache_key = tuple(sorted((k, str(v)) for k, v in params.items() if k != 'api_key'))
+        cached = SERPAPI_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        session = await self.get_session()
+        for attempt in range(API_MAX_RETRIES + 1):
+            async with SERPAPI_SEMAPHORE, session.get("https://serpapi.com/search.json", params=params) as response:
+                if response.status not in RETRYABLE_STATUSES or attempt == API_MAX_RETRIES:
+                    # SerpAPI sends JSON error bodies with non-200 statuses too
+                    results = await response.json(loads=load_json, content_type=None)
+                    break
+            await asyncio.sleep(backoff_delay(attempt))
+        if isinstance(results, dict) and 'error' not in results:
+            SERPAPI_CACHE.set(cache_key, results)
+        return results
+    
     async def collect_page_speed_metrics(self, url: str, api_key: str, device: str = "desktop") -> Dict:
         """Collect page speed metrics using Google PageSpeed Insights API"""
         try:
-            await self.start_session()
+            cache_key = (url, device.lower())
+            cached = PAGESPEED_CACHE.get(cache_key)
+            if cached is not None:
+                return cached
+            
+            session = await self.get_session()
             
             # Google PageSpeed Insights API
             api_url = "https://www.googleapis.com/pagespeedonline/v5/runPagespeed"
@@ -501,44 +970,36 @@ class SEOScraperComplete:
                 'category': ['PERFORMANCE', 'ACCESSIBILITY', 'BEST_PRACTICES', 'SEO']
             }
             
-            async with self.session.get(api_url, params=params) as response:
+            async with session.get(api_url, params=params, timeout=PAGESPEED_TIMEOUT) as response:
                 if response.status == 200:
                     data = await response.json()
                     
                     # Extract Core Web Vitals
-                    lighthouse_data = data.get('lighthouseResult', {})
-                    audits = lighthouse_data.get('audits', {})
+                    lighthouse_data = data.get('lighthouseResult') or {}
+                    audits = lighthouse_data.get('audits') or {}
+                    categories = lighthouse_data.get('categories') or {}
                     
                     speed_data = {
                         'url': url,
-                        'test_date': time.strftime('%Y-%m-%d %H:%M:%S'),
+                        'test_date': utc_timestamp(),
                         'device': device,
                         'core_web_vitals': {
-                            'largest_contentful_paint': audits.get('largest-contentful-paint', {}).get('numericValue', 0) / 1000,
-                            'first_input_delay': audits.get('max-potential-fid', {}).get('numericValue', 0),
-                            'cumulative_layout_shift': audits.get('cumulative-layout-shift', {}).get('numericValue', 0),
-                            'first_contentful_paint': audits.get('first-contentful-paint', {}).get('numericValue', 0) / 1000,
-                            'time_to_interactive': audits.get('interactive', {}).get('numericValue', 0) / 1000
+                            'largest_contentful_paint': self._audit_numeric_value(audits, 'largest-contentful-paint') / 1000,
+                            'first_input_delay': self._audit_numeric_value(audits, 'max-potential-fid'),
+                            'cumulative_layout_shift': self._audit_numeric_value(audits, 'cumulative-layout-shift'),
+                            'first_contentful_paint': self._audit_numeric_value(audits, 'first-contentful-paint') / 1000,
+                            'time_to_interactive': self._audit_numeric_value(audits, 'interactive') / 1000
                         },
                         'lighthouse_scores': {
-                            'performance': lighthouse_data.get('categories', {}).get('performance', {}).get('score', 0) * 100,
-                            'accessibility': lighthouse_data.get('categories', {}).get('accessibility', {}).get('score', 0) * 100,
-                            'best_practices': lighthouse_data.get('categories', {}).get('best-practices', {}).get('score', 0) * 100,
-                            'seo': lighthouse_data.get('categories', {}).get('seo', {}).get('score', 0) * 100
+                            'performance': self._category_score(categories, 'performance'),
+                            'accessibility': self._category_score(categories, 'accessibility'),
+                            'best_practices': self._category_score(categories, 'best-practices'),
+                            'seo': self._category_score(categories, 'seo')
                         },
-                        'opportunities': [
-                            {
-                                'id': audit_id,
-                                'title': audit_data.get('title', ''),
-                                'description': audit_data.get('description', ''),
-                                'score': audit_data.get('score', 0),
-                                'potential_savings': audit_data.get('details', {}).get('overallSavingsMs', 0)
-                            }
-                            for audit_id, audit_data in audits.items()
-                            if audit_data.get('scoreDisplayMode') == 'numeric' and audit_data.get('score', 1) < 0.9
-                        ]
+                        'opportunities': self._extract_opportunities(audits)
                     }
                     
+                    PAGESPEED_CACHE.set(cache_key, speed_data)
                     return speed_data
                 else:
                     return {'error': f"PageSpeed API error: {response.status}"}
@@ -546,12 +1007,44 @@ class SEOScraperComplete:
         except Exception as e:
             return {'error': f"Page speed collection failed: {str(e)}"}
     
+    @staticmethod
+    def _audit_numeric_value(audits: Dict, audit_id: str) -> float:
+        """numericValue of a Lighthouse audit, 0 when the audit is missing or errored"""
+        audit = audits.get(audit_id)
+        return (audit.get('numericValue') or 0) if audit else 0
+    
+    @staticmethod
+    def _extract_opportunities(audits: Dict) -> List[Dict]:
+        """Numeric Lighthouse audits scoring below 0.9, filtered before any field is read"""
+        opportunities = []
+        for audit_id, audit_data in audits.items():
+            if audit_data.get('scoreDisplayMode') != 'numeric':
+                continue
+            score = audit_data.get('score')
+            if score is None or score >= 0.9:
+                continue
+            details = audit_data.get('details') or EMPTY_MAPPING
+            opportunities.append({
+                'id': audit_id,
+                'title': audit_data.get('title', ''),
+                'description': audit_data.get('description', ''),
+                'score': score,
+                'potential_savings': details.get('overallSavingsMs', 0)
+            })
+        return opportunities
+    
+    @staticmethod
+    def _category_score(categories: Dict, category_id: str) -> float:
+        """Lighthouse category score scaled to 0-100, 0 when missing"""
+        category = categories.get(category_id)
+        return (category.get('score') or 0) * 100 if category else 0
+    
     async def collect_server_headers(self, url: str) -> Dict:
         """Collect server response headers - critical for technical SEO"""
         try:
-            await self.start_session()
+            session = await self.get_session()
             
-            async with self.session.head(url, allow_redirects=True) as response:
+            async with session.head(url, allow_redirects=True) as response:
                 headers_data = {
                     'url': url,
                     'status_code': response.status,
@@ -588,7 +1081,6 @@ class SEOScraperComplete:
     async def analyze_redirect_chain(self, url: str) -> Dict:
         """Enhanced redirect chain analysis with detailed information"""
         try:
-            await self.start_session()
             redirect_data = {
                 'original_url': url,
                 'redirect_chain': [],
@@ -600,77 +1092,102 @@ class SEOScraperComplete:
             }
             
             start_time = time.time()
+            current_url = url
+            visited = {url}
             
-            async with self.session.get(url, allow_redirects=True) as response:
-                redirect_data['final_url'] = str(response.url)
-                redirect_data['total_redirects'] = len(response.history)
-                redirect_data['redirect_time'] = time.time() - start_time
+            # Walk the chain hop by hop with HEAD so no response bodies are downloaded
+            for _ in range(MAX_REDIRECT_HOPS):
+                status, headers = await self._probe_redirect(current_url)
+                location = headers.get('Location')
+                if status not in REDIRECT_STATUSES or not location:
+                    break
                 
-                # Build detailed redirect chain
-                for i, redirect in enumerate(response.history):
-                    redirect_info = {
-                        'step': i + 1,
-                        'from_url': str(redirect.url),
-                        'status_code': redirect.status,
-                        'redirect_type': self.classify_redirect(redirect.status),
-                        'location_header': redirect.headers.get('Location', ''),
-                        'response_time': redirect.headers.get('X-Response-Time', 'Unknown')
-                    }
-                    redirect_data['redirect_chain'].append(redirect_info)
-                    redirect_data['redirect_types'].append(redirect.status)
-                
-                # Detect redirect issues
-                if redirect_data['total_redirects'] > 3:
-                    redirect_data['redirect_issues'].append('Too many redirects (>3)')
-                
-                if redirect_data['total_redirects'] > 0:
-                    # Check for redirect loops
-                    urls_in_chain = [r['from_url'] for r in redirect_data['redirect_chain']]
-                    if len(urls_in_chain) != len(set(urls_in_chain)):
-                        redirect_data['redirect_issues'].append('Redirect loop detected')
-                    
-                    # Check for mixed redirect types
-                    if len(set(redirect_data['redirect_types'])) > 1:
-                        redirect_data['redirect_issues'].append('Mixed redirect types')
+                redirect_data['redirect_chain'].append({
+                    'step': len(redirect_data['redirect_chain']) + 1,
+                    'from_url': current_url,
+                    'status_code': status,
+                    'redirect_type': self.classify_redirect(status),
+                    'location_header': location,
+                    'response_time': headers.get('X-Response-Time', 'Unknown')
+                })
+                redirect_data['redirect_types'].append(status)
                 
-                return redirect_data
+                current_url = urljoin(current_url, location)
+                if current_url in visited:
+                    redirect_data['redirect_issues'].append('Redirect loop detected')
+                    break
+                visited.add(current_url)
+            else:
+                redirect_data['redirect_issues'].append(f'Redirect limit reached ({MAX_REDIRECT_HOPS} hops)')
+            
+            redirect_data['final_url'] = current_url
+            redirect_data['total_redirects'] = len(redirect_data['redirect_chain'])
+            redirect_data['redirect_time'] = time.time() - start_time
+            
+            # Detect redirect issues
+            if redirect_data['total_redirects'] > 3:
+                redirect_data['redirect_issues'].append('Too many redirects (>3)')
+            
+            # Check for mixed redirect types
+            if len(set(redirect_data['redirect_types'])) > 1:
+                redirect_data['redirect_issues'].append('Mixed redirect types')
+            
+            return redirect_data
                 
         except Exception as e:
             return {'error': f"Redirect analysis failed: {str(e)}"}
     
+    async def _probe_redirect(self, url: str):
+        """Single non-following request for one hop; falls back to GET when HEAD isn't allowed"""
+        session = await self.get_session()
+        async with session.head(url, allow_redirects=False) as response:
+            if response.status not in (405, 501):
+                return response.status, response.headers
+        async with session.get(url, allow_redirects=False) as response:
+            return response.status, response.headers
+    
+    async def full_audit(self, url: str, psi_key: Optional[str] = None, device: str = "desktop") -> Dict:
+        """Run the page scrape, header, redirect and PageSpeed probes for one URL concurrently"""
+        probes = {
+            'seo_data': self.scrape_seo_data(url),
+            'server_headers': self.collect_server_headers(url),
+            'redirect_chain': self.analyze_redirect_chain(url)
+        }
+        if psi_key:
+            probes['page_speed'] = self.collect_page_speed_metrics(url, psi_key, device)
+        
+        results = await asyncio.gather(*probes.values(), return_exceptions=True)
+        
+        audit_data = {
+            'url': url,
+            'audit_date': utc_timestamp(),
+            'device': device
+        }
+        for name, result in zip(probes, results):
+            if isinstance(result, Exception):
+                audit_data[name] = {'error': f"{name} failed: {str(result)}"}
+            else:
+                audit_data[name] = result
+        
+        if not psi_key:
+            audit_data['page_speed'] = {'error': 'Skipped: no Google PageSpeed API key provided'}
+        
+        return audit_data
+    
     def classify_redirect(self, status_code: int) -> str:
         """Classify redirect type"""
-        redirect_types = {
-            300: 'Multiple Choices',
-            301: 'Moved Permanently',
-            302: 'Found (Temporary)',
-            303: 'See Other',
-            304: 'Not Modified',
-            307: 'Temporary Redirect',
-            308: 'Permanent Redirect'
-        }
-        return redirect_types.get(status_code, f'Unknown ({status_code})')
+        return REDIRECT_TYPES.get(status_code, f'Unknown ({status_code})')
     
     async def detect_javascript_rendering(self, url: str) -> Dict:
         """Detect if content is JavaScript-rendered by comparing no-JS vs JS-rendered content"""
         try:
-            await self.start_browser()
-            await self.start_session()
-            
-            # Get content without JavaScript
-            async with self.session.get(url) as response:
-                no_js_html = await response.text()
-                no_js_soup = BeautifulSoup(no_js_html, 'lxml')
-                no_js_text = no_js_soup.get_text().strip()
-                no_js_word_count = len(no_js_text.split())
-            
-            # Get content with JavaScript
-            page = await self.context.new_page()
-            await page.goto(url, wait_until="networkidle")
-            js_html = await page.content()
-            js_soup = BeautifulSoup(js_html, 'lxml')
-            js_text = js_soup.get_text().strip()
-            js_word_count = len(js_text.split())
+            # The plain HTTP fetch and the browser render are independent, so overlap them
+            (no_js_html, no_js_charset), js_html = await asyncio.gather(
+                self._fetch_html(url),
+                self.render_html(url)
+            )
+            no_js_word_count = self._rendered_word_count(no_js_html, no_js_charset)
+            js_word_count = self._rendered_word_count(js_html)
             
             # Compare content
             content_difference = abs(js_word_count - no_js_word_count)
@@ -696,104 +1213,144 @@ class SEOScraperComplete:
                 js_detection['seo_concerns'].append('Very little content available without JavaScript')
                 js_detection['recommendations'].append('Implement progressive enhancement')
             
-            await page.close()
             return js_detection
             
         except Exception as e:
             return {'error': f"JavaScript rendering detection failed: {str(e)}"}
     
+    async def _fetch_html(self, url: str) -> Tuple[bytes, Optional[str]]:
+        """Raw page bytes as served, without running JavaScript, plus the Content-Type charset if any"""
+        session = await self.get_session()
+        async with session.get(url) as response:
+            # Undecoded: lxml handles the charset in C, skipping aiohttp's detection and a str copy
+            return await response.read(), response.charset
+    
+    def _rendered_word_count(self, html: bytes, encoding: Optional[str] = 'utf-8') -> int:
+        """Count words in a page's text, ignoring script and style contents
+        
+        encoding=None lets lxml detect the charset from the document itself.
+        """
+        if not html.strip():
+            return 0
+        if encoding == 'utf-8':
+            root = self._parse_tree(html)
+        else:
+            try:
+                parser = lxml_html.HTMLParser(encoding=encoding, **HTML_PARSER_OPTIONS)
+            except LookupError:
+                parser = lxml_html.HTMLParser(**HTML_PARSER_OPTIONS)  # Unknown charset label; fall back to detection
+            root = lxml_html.document_fromstring(html, parser=parser)
+        etree.strip_elements(root, 'script', 'style', with_tail=False)
+        # str.split() runs in C and beats a finditer() loop; the list is freed immediately
+        return len(root.text_content().split())
+    
     # Basic helper methods for data extraction
     def extract_title(self, soup: BeautifulSoup) -> Optional[str]:
         title_tag = soup.find('title')
-        return title_tag.get_text().strip() if title_tag else None
-    
-    def extract_meta_tags(self, soup: BeautifulSoup) -> Dict:
-        meta_tags = {}
-        for meta in soup.find_all('meta'):
-            if meta.get('name'):
-                meta_tags[meta.get('name')] = meta.get('content', '')
-            elif meta.get('property'):
-                meta_tags[meta.get('property')] = meta.get('content', '')
-            elif meta.get('http-equiv'):
-                meta_tags[meta.get('http-equiv')] = meta.get('content', '')
-        return meta_tags
-    
-    def extract_headers(self, soup: BeautifulSoup) -> Dict:
+        return normalize_whitespace(title_tag.get_text()) if title_tag else None
+    
+    def _collect_meta(self, root: lxml_html.HtmlElement) -> Dict:
+        """Bucket every <meta> tag in a single pass for the extract_meta_* helpers"""
+        meta = {'name': {}, 'property': {}, 'http_equiv': {}, 'all': {}, 'og': {}, 'twitter': {}}
+        for tag in root.iter('meta'):
+            content = tag.get('content', '')
+            name = tag.get('name')
+            prop = tag.get('property')
+            http_equiv = tag.get('http-equiv')
+            
+            if name:
+                meta['name'].setdefault(name, tag.get('content'))
+                meta['all'][name] = content
+                if name.startswith('twitter:'):
+                    meta['twitter'][name] = content
+            elif prop:
+                meta['all'][prop] = content
+            elif http_equiv:
+                meta['all'][http_equiv] = content
+            
+            if prop:
+                meta['property'].setdefault(prop, tag.get('content'))
+                if prop.startswith('og:'):
+                    meta['og'][prop] = content
+            if http_equiv:
+                meta['http_equiv'].setdefault(http_equiv, tag.get('content'))
+        
+        # First matching tag wins
+        meta['viewport'] = meta['name'].get('viewport')
+        meta['robots'] = meta['name'].get('robots')
+        meta['refresh'] = meta['http_equiv'].get('refresh')
+        return meta
+    
+    def extract_meta_tags(self, meta: Dict) -> Dict:
+        return meta['all']
+    
+    def extract_headers(self, root: lxml_html.HtmlElement) -> Dict:
         headers = {'h1': [], 'h2': [], 'h3': [], 'h4': [], 'h5': [], 'h6': []}
-        for i in range(1, 7):
-            header_tags = soup.find_all(f'h{i}')
-            headers[f'h{i}'] = [h.get_text().strip() for h in header_tags]
+        for h in HEADINGS_XPATH(root):
+            headers[h.tag].append(normalize_whitespace(h.text_content()))
         return headers
     
-    def extract_schema_markup(self, soup: BeautifulSoup) -> List[Dict]:
+    def extract_schema_markup(self, root: lxml_html.HtmlElement) -> List[Dict]:
         schema_data = []
-        scripts = soup.find_all('script', type='application/ld+json')
-        for script in scripts:
+        for script_text in JSON_LD_XPATH(root):
             try:
-                schema_content = json.loads(script.string)
+                schema_content = load_json(script_text)
                 schema_data.append(schema_content)
             except json.JSONDecodeError:
                 continue
         return schema_data
     
-    def extract_open_graph(self, soup: BeautifulSoup) -> Dict:
-        og_tags = {}
-        for meta in soup.find_all('meta'):
-            property_attr = meta.get('property', '')
-            if property_attr.startswith('og:'):
-                og_tags[property_attr] = meta.get('content', '')
-        return og_tags
-    
-    def extract_twitter_cards(self, soup: BeautifulSoup) -> Dict:
-        twitter_tags = {}
-        for meta in soup.find_all('meta'):
-            name_attr = meta.get('name', '')
-            if name_attr.startswith('twitter:'):
-                twitter_tags[name_attr] = meta.get('content', '')
-        return twitter_tags
-    
-    def extract_internal_links(self, soup: BeautifulSoup, base_url: str) -> List[Dict]:
-        internal_links = []
-        base_domain = urlparse(base_url).netloc
-        
-        for link in soup.find_all('a', href=True):
-            href = link['href']
-            full_url = urljoin(base_url, href)
-            link_domain = urlparse(full_url).netloc
-            
-            if link_domain == base_domain or not link_domain:
-                internal_links.append({
-                    'url': full_url,
-                    'anchor_text': link.get_text().strip(),
-                    'title': link.get('title', ''),
-                    'rel': link.get('rel', [])
-                })
-        
-        return internal_links
+    def extract_open_graph(self, meta: Dict) -> Dict:
+        return meta['og']
+    
+    def extract_twitter_cards(self, meta: Dict) -> Dict:
+        return meta['twitter']
     
-    def extract_external_links(self, soup: BeautifulSoup, base_url: str) -> List[Dict]:
-        """Extract external links"""
+    def _collect_links(self, soup: BeautifulSoup, base_url: str) -> Tuple[List[Dict], List[Dict]]:
+        """Split anchors into internal and external links in one pass"""
+        internal_links = []
         external_links = []
-        base_domain = urlparse(base_url).netloc
+        base_domain = urlsplit(base_url).netloc
+        # Nav/footer hrefs repeat a lot, so resolve each distinct href once per page
+        resolved: Dict[str, Optional[Tuple[List[Dict], str]]] = {}
         
         for link in soup.find_all('a', href=True):
             href = link['href']
-            if href.startswith('http'):
-                link_domain = urlparse(href).netloc
+            if href in resolved:
+                target = resolved[href]
+            elif href.startswith(('http://', 'https://')):
+                # Absolute hrefs resolve to themselves; only same-site ones need urljoin's normalization
+                link_domain = urlsplit(href).netloc
                 if link_domain != base_domain:
-                    external_links.append({
-                        'url': href,
-                        'anchor_text': link.get_text().strip(),
-                        'title': link.get('title', ''),
-                        'rel': link.get('rel', [])
-                    })
+                    target = resolved[href] = (external_links, href)
+                else:
+                    target = resolved[href] = (internal_links, urljoin(base_url, href))
+            else:
+                full_url = urljoin(base_url, href)
+                link_domain = urlsplit(full_url).netloc
+                if link_domain == base_domain or not link_domain:
+                    target = resolved[href] = (internal_links, full_url)
+                elif href.startswith('http'):
+                    target = resolved[href] = (external_links, href)
+                else:
+                    target = resolved[href] = None
+            
+            if target is None:
+                continue
+            bucket, link_url = target
+            bucket.append({
+                'url': link_url,
+                'anchor_text': normalize_whitespace(link.get_text()),
+                'title': link.get('title', ''),
+                'rel': link.get('rel', [])
+            })
         
-        return external_links
+        return internal_links, external_links
     
-    def extract_hreflang(self, soup: BeautifulSoup) -> List[Dict]:
+    def extract_hreflang(self, root: lxml_html.HtmlElement) -> List[Dict]:
         """Extract hreflang attributes"""
         hreflang_links = []
-        for link in soup.find_all('link', rel='alternate'):
+        for link in ALTERNATE_XPATH(root):
             hreflang = link.get('hreflang')
             href = link.get('href')
             if hreflang and href:
@@ -803,38 +1360,37 @@ class SEOScraperComplete:
                 })
         return hreflang_links
     
-    def extract_meta_refresh(self, soup: BeautifulSoup) -> Optional[str]:
+    def extract_meta_refresh(self, meta: Dict) -> Optional[str]:
         """Extract meta refresh directive"""
-        meta_refresh = soup.find('meta', attrs={'http-equiv': 'refresh'})
-        return meta_refresh.get('content') if meta_refresh else None
+        return meta['refresh']
     
     def extract_base_href(self, soup: BeautifulSoup) -> Optional[str]:
         """Extract base href if present"""
-        base_tag = soup.find('base', href=True)
+        base_tag = soup.select_one(BASE_HREF_SELECTOR)
         return base_tag.get('href') if base_tag else None
     
-    def get_word_count(self, soup: BeautifulSoup) -> int:
-        for script in soup(["script", "style"]):
-            script.decompose()
-        text = soup.get_text()
-        words = text.split()
-        return len(words)
+    def get_word_count(self, full_text: str) -> int:
+        """Count words in whitespace-normalized text from extract_full_text"""
+        return full_text.count(' ') + 1 if full_text else 0
     
-    def extract_meta_viewport(self, soup: BeautifulSoup) -> Optional[str]:
-        viewport = soup.find('meta', attrs={'name': 'viewport'})
-        return viewport.get('content') if viewport else None
+    def extract_meta_viewport(self, meta: Dict) -> Optional[str]:
+        return meta['viewport']
     
-    def extract_canonical(self, soup: BeautifulSoup) -> Optional[str]:
-        canonical = soup.find('link', rel='canonical')
-        return canonical.get('href') if canonical else None
+    def extract_canonical(self, root: lxml_html.HtmlElement) -> Optional[str]:
+        canonical = CANONICAL_XPATH(root)
+        return canonical[0].get('href') if canonical else None
     
-    def extract_robots_meta(self, soup: BeautifulSoup) -> Optional[str]:
-        robots = soup.find('meta', attrs={'name': 'robots'})
-        return robots.get('content') if robots else None
+    def extract_robots_meta(self, meta: Dict) -> Optional[str]:
+        return meta['robots']
 
 # Global scraper instance
 scraper = SEOScraperComplete()
 
+@lru_cache(maxsize=4)
+def ke_api_for_key(api_key: str) -> KeywordsEverywhereAPI:
+    """Reuse one Keywords Everywhere client per explicitly passed API key"""
+    return KeywordsEverywhereAPI(api_key, session_provider=scraper.get_session)
+
 # FIXED: Helper function to safely extract CPC values from Keywords Everywhere API
 def extract_cpc_value(cpc_data) -> float:
     """
@@ -846,16 +1402,17 @@ def extract_cpc_value(cpc_data) -> float:
     Returns:
         float: Numeric CPC value, defaults to 0.0 if not parseable
     """
-    if cpc_data is None:
-        return 0.0
-    
     # Handle nested CPC object: {"currency": "$", "value": "0.09"}
+    # Checked first: every Keywords Everywhere row uses this shape
     if isinstance(cpc_data, dict) and 'value' in cpc_data:
         try:
             return float(cpc_data['value'])
         except (ValueError, TypeError):
             return 0.0
     
+    if cpc_data is None:
+        return 0.0
+    
     # Handle direct numeric value (backward compatibility)
     if isinstance(cpc_data, (int, float)):
         return float(cpc_data)
@@ -875,9 +1432,9 @@ async def scrape_seo_data(url: str) -> str:
     """Extract comprehensive SEO data from a webpage - raw data for Claude analysis"""
     try:
         seo_data = await scraper.scrape_seo_data(url)
-        return json.dumps(seo_data, indent=2, ensure_ascii=False)
+        return dump_json(seo_data)
     except Exception as e:
-        return json.dumps({'error': f"Failed to scrape {url}: {str(e)}"}, indent=2)
+        return dump_json({'error': f"Failed to scrape {url}: {str(e)}"})
 
 @mcp.tool()
 async def collect_server_headers(url: str) -> str:
@@ -892,9 +1449,9 @@ async def collect_server_headers(url: str) -> str:
     """
     try:
         headers_data = await scraper.collect_server_headers(url)
-        return json.dumps(headers_data, indent=2, ensure_ascii=False)
+        return dump_json(headers_data)
     except Exception as e:
-        return json.dumps({'error': f"Header collection failed: {str(e)}"}, indent=2)
+        return dump_json({'error': f"Header collection failed: {str(e)}"})
 
 @mcp.tool()
 async def analyze_redirect_chain(url: str) -> str:
@@ -909,9 +1466,9 @@ async def analyze_redirect_chain(url: str) -> str:
     """
     try:
         redirect_data = await scraper.analyze_redirect_chain(url)
-        return json.dumps(redirect_data, indent=2, ensure_ascii=False)
+        return dump_json(redirect_data)
     except Exception as e:
-        return json.dumps({'error': f"Redirect analysis failed: {str(e)}"}, indent=2)
+        return dump_json({'error': f"Redirect analysis failed: {str(e)}"})
 
 @mcp.tool()
 async def validate_structured_data(url: str) -> str:
@@ -925,20 +1482,15 @@ async def validate_structured_data(url: str) -> str:
         JSON string with comprehensive structured data validation including rich results eligibility
     """
     try:
-        await scraper.start_browser()
-        page = await scraper.context.new_page()
-        await page.goto(url, wait_until="networkidle")
-        html_content = await page.content()
-        soup = BeautifulSoup(html_content, 'lxml')
+        root = await scraper.fetch_tree(url)
         
-        validation_data = scraper.validate_structured_data_enhanced(soup)
+        validation_data = scraper.validate_structured_data_enhanced(root)
         validation_data['url'] = url
-        validation_data['test_date'] = time.strftime('%Y-%m-%d %H:%M:%S')
+        validation_data['test_date'] = utc_timestamp()
         
-        await page.close()
-        return json.dumps(validation_data, indent=2, ensure_ascii=False)
+        return dump_json(validation_data)
     except Exception as e:
-        return json.dumps({'error': f"Structured data validation failed: {str(e)}"}, indent=2)
+        return dump_json({'error': f"Structured data validation failed: {str(e)}"})
 
 @mcp.tool()
 async def detect_javascript_rendering(url: str) -> str:
@@ -953,9 +1505,9 @@ async def detect_javascript_rendering(url: str) -> str:
     """
     try:
         js_detection = await scraper.detect_javascript_rendering(url)
-        return json.dumps(js_detection, indent=2, ensure_ascii=False)
+        return dump_json(js_detection)
     except Exception as e:
-        return json.dumps({'error': f"JavaScript rendering detection failed: {str(e)}"}, indent=2)
+        return dump_json({'error': f"JavaScript rendering detection failed: {str(e)}"})
 
 @mcp.tool()
 async def serp_data_collector(keyword: str, api_key: str = None, location: str = "United States", device: str = "desktop") -> str:
@@ -977,12 +1529,12 @@ async def serp_data_collector(keyword: str, api_key: str = None, location: str =
             api_key = os.getenv('SERPAPI_KEY')
         
         if not api_key:
-            return json.dumps({
+            return dump_json({
                 'error': 'API key is required. Either provide api_key parameter or set SERPAPI_KEY environment variable.',
                 'keyword': keyword,
-                'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'timestamp': utc_timestamp(),
                 'setup_instructions': 'Create a .env file with SERPAPI_KEY=your_key_here'
-            }, indent=2)
+            })
         
         # SerpAPI parameters
         params = {
@@ -997,23 +1549,22 @@ async def serp_data_collector(keyword: str, api_key: str = None, location: str =
         }
         
         # Execute search
-        search = GoogleSearch(params)
-        results = search.get_dict()
+        results = await scraper.serpapi_search(params)
         
         # Check for API errors
         if 'error' in results:
-            return json.dumps({
+            return dump_json({
                 'error': f"SerpAPI error: {results['error']}",
                 'keyword': keyword,
                 'location': location,
-                'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'timestamp': utc_timestamp(),
                 'api_used': 'SerpAPI'
-            }, indent=2)
+            })
         
         # Initialize response structure
         serp_data = {
             'keyword': keyword,
-            'search_date': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'search_date': utc_timestamp(),
             'location': location,
             'device': device,
             'total_results': 0,
@@ -1121,7 +1672,7 @@ async def serp_data_collector(keyword: str, api_key: str = None, location: str =
             'detected_location': results.get('search_parameters', {}).get('location', location)
         }
         
-        return json.dumps(serp_data, indent=2, ensure_ascii=False)
+        return dump_json(serp_data)
         
     except Exception as e:
         error_response = {
@@ -1130,10 +1681,10 @@ async def serp_data_collector(keyword: str, api_key: str = None, location: str =
             'keyword': keyword,
             'location': location,
             'device': device,
-            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'timestamp': utc_timestamp(),
             'api_used': 'SerpAPI'
         }
-        return json.dumps(error_response, indent=2)
+        return dump_json(error_response)
 
 @mcp.tool()
 async def page_speed_metrics(url: str, api_key: str = None, device: str = "desktop") -> str:
@@ -1154,17 +1705,40 @@ async def page_speed_metrics(url: str, api_key: str = None, device: str = "deskt
             api_key = os.getenv('GOOGLE_PAGESPEED_KEY')
         
         if not api_key:
-            return json.dumps({
+            return dump_json({
                 'error': 'Google PageSpeed API key is required. Either provide api_key parameter or set GOOGLE_PAGESPEED_KEY environment variable.',
                 'url': url,
-                'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'timestamp': utc_timestamp(),
                 'setup_instructions': 'Create a .env file with GOOGLE_PAGESPEED_KEY=your_key_here'
-            }, indent=2)
+            })
         
         speed_data = await scraper.collect_page_speed_metrics(url, api_key, device)
-        return json.dumps(speed_data, indent=2, ensure_ascii=False)
+        return dump_json(speed_data)
+    except Exception as e:
+        return dump_json({'error': f"Page speed analysis failed: {str(e)}"})
+
+@mcp.tool()
+async def full_page_audit(url: str, api_key: str = None, device: str = "desktop") -> str:
+    """
+    Run SEO scrape, server headers, redirect chain and PageSpeed collection for a URL concurrently
+    
+    Args:
+        url: URL to audit
+        api_key: Google PageSpeed Insights API key (optional, uses environment variable if not provided; PageSpeed is skipped without one)
+        device: Device type for PageSpeed (desktop or mobile)
+        
+    Returns:
+        JSON string with the combined output of scrape_seo_data, collect_server_headers, analyze_redirect_chain and page_speed_metrics
+    """
+    try:
+        # Use provided API key or fall back to environment variable
+        if api_key is None:
+            api_key = os.getenv('GOOGLE_PAGESPEED_KEY')
+        
+        audit_data = await scraper.full_audit(url, api_key, device)
+        return dump_json(audit_data)
     except Exception as e:
-        return json.dumps({'error': f"Page speed analysis failed: {str(e)}"}, indent=2)
+        return dump_json({'error': f"Full page audit failed: {str(e)}"})
 
 # SERP-Content Alignment Analyzer - Pure Data Collection
 @mcp.tool()
@@ -1187,11 +1761,11 @@ async def analyze_serp_content_alignment(keyword: str, target_url: str, api_key:
             api_key = os.getenv('SERPAPI_KEY')
         
         if not api_key:
-            return json.dumps({
+            return dump_json({
                 'error': 'SerpAPI key is required. Either provide api_key parameter or set SERPAPI_KEY environment variable.',
                 'keyword': keyword,
                 'target_url': target_url
-            }, indent=2)
+            })
         
         # Step 1: Get SERP results
         params = {
@@ -1204,15 +1778,14 @@ async def analyze_serp_content_alignment(keyword: str, target_url: str, api_key:
             "num": 10
         }
         
-        search = GoogleSearch(params)
-        serp_results = search.get_dict()
+        serp_results = await scraper.serpapi_search(params)
         
         if 'error' in serp_results:
-            return json.dumps({
+            return dump_json({
                 'error': f"SerpAPI error: {serp_results['error']}",
                 'keyword': keyword,
                 'target_url': target_url
-            }, indent=2)
+            })
         
         # Step 2: Extract top 10 organic results URLs
         organic_results = serp_results.get('organic_results', [])
@@ -1232,7 +1805,7 @@ async def analyze_serp_content_alignment(keyword: str, target_url: str, api_key:
         
         alignment_data = {
             'keyword': keyword,
-            'analysis_date': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'analysis_date': utc_timestamp(),
             'serp_metadata': {
                 'location': location,
                 'total_results': serp_results.get('search_information', {}).get('total_results', 0)
@@ -1261,117 +1834,121 @@ async def analyze_serp_content_alignment(keyword: str, target_url: str, api_key:
                 search.get('query', '') for search in serp_results['related_searches'][:8]
             ]
         
-        # Step 4: Scrape target page
-        try:
-            target_page_data = await scraper.scrape_seo_data(target_url)
-            if 'error' not in target_page_data:
-                alignment_data['target_page'] = {
-                    'url': target_url,
-                    'title': target_page_data.get('title', ''),
-                    'meta_description': target_page_data.get('meta_tags', {}).get('description', ''),
-                    'main_content': target_page_data.get('main_content', ''),
-                    'full_text': target_page_data.get('full_text', ''),
-                    'word_count': target_page_data.get('word_count', 0),
-                    'headings': target_page_data.get('headers', {}),
-                    'schema_markup': target_page_data.get('schema_markup', []),
-                    'internal_links_count': len(target_page_data.get('internal_links', [])),
-                    'external_links_count': len(target_page_data.get('external_links', []))
+        # Step 4: Scrape the target and all competitor pages concurrently; the semaphore replaces the per-request delay
+        semaphore = asyncio.Semaphore(COMPETITOR_SCRAPE_CONCURRENCY)
+        # Per-call memo: a URL listed twice (or equal to target_url) is scraped once and shared
+        scrapes: Dict[str, asyncio.Future] = {}
+        
+        def scrape_once(page_url: str) -> asyncio.Future:
+            if page_url not in scrapes:
+                scrapes[page_url] = asyncio.ensure_future(scraper.scrape_seo_data(page_url))
+            return scrapes[page_url]
+        
+        async def scrape_competitor(i: int, competitor: Dict) -> Dict:
+            async with semaphore:
+                print(f"Scraping competitor {i+1}/10: {competitor['url']}", file=sys.stderr)
+                competitor_data = await scrape_once(competitor['url'])
+            
+            if 'error' in competitor_data:
+                return {
+                    'serp_position': competitor['position'],
+                    'url': competitor['url'],
+                    'error': competitor_data.get('error')
                 }
-            else:
-                alignment_data['target_page'] = {'url': target_url, 'error': target_page_data.get('error')}
-        except Exception as e:
-            alignment_data['target_page'] = {'url': target_url, 'error': f"Failed to scrape target page: {str(e)}"}
+            return {
+                'serp_position': competitor['position'],
+                'url': competitor['url'],
+                'title': competitor_data.get('title', ''),
+                'serp_title': competitor['title'],  # Title from SERP vs actual title
+                'meta_description': competitor_data.get('meta_tags', {}).get('description', ''),
+                'serp_snippet': competitor['snippet'],  # Snippet from SERP vs actual meta
+                'main_content': competitor_data.get('main_content', ''),
+                'full_text': competitor_data.get('full_text', ''),
+                'word_count': competitor_data.get('word_count', 0),
+                'headings': competitor_data.get('headers', {}),
+                'schema_markup': competitor_data.get('schema_markup', []),
+                'internal_links_count': len(competitor_data.get('internal_links', [])),
+                'external_links_count': len(competitor_data.get('external_links', []))
+            }
         
-        # Step 5: Scrape all competitor pages
-        for i, competitor in enumerate(competitor_urls):
-            try:
-                print(f"Scraping competitor {i+1}/10: {competitor['url']}")
-                
-                competitor_data = await scraper.scrape_seo_data(competitor['url'])
-                
-                if 'error' not in competitor_data:
-                    competitor_analysis = {
-                        'serp_position': competitor['position'],
-                        'url': competitor['url'],
-                        'title': competitor_data.get('title', ''),
-                        'serp_title': competitor['title'],  # Title from SERP vs actual title
-                        'meta_description': competitor_data.get('meta_tags', {}).get('description', ''),
-                        'serp_snippet': competitor['snippet'],  # Snippet from SERP vs actual meta
-                        'main_content': competitor_data.get('main_content', ''),
-                        'full_text': competitor_data.get('full_text', ''),
-                        'word_count': competitor_data.get('word_count', 0),
-                        'headings': competitor_data.get('headers', {}),
-                        'schema_markup': competitor_data.get('schema_markup', []),
-                        'internal_links_count': len(competitor_data.get('internal_links', [])),
-                        'external_links_count': len(competitor_data.get('external_links', []))
-                    }
-                else:
-                    competitor_analysis = {
-                        'serp_position': competitor['position'],
-                        'url': competitor['url'],
-                        'error': competitor_data.get('error')
-                    }
-                
-                alignment_data['top_10_competitors'].append(competitor_analysis)
-                
-                # Add delay between requests
-                await asyncio.sleep(random.uniform(1.0, 2.0))
-                
-            except Exception as e:
-                alignment_data['top_10_competitors'].append({
+        target_page_data, *results = await asyncio.gather(
+            scrape_once(target_url),
+            *(scrape_competitor(i, competitor) for i, competitor in enumerate(competitor_urls)),
+            return_exceptions=True
+        )
+        
+        # Step 5: Record the target page, scraped alongside the competitors
+        if isinstance(target_page_data, Exception):
+            alignment_data['target_page'] = {'url': target_url, 'error': f"Failed to scrape target page: {str(target_page_data)}"}
+        elif 'error' not in target_page_data:
+            alignment_data['target_page'] = {
+                'url': target_url,
+                'title': target_page_data.get('title', ''),
+                'meta_description': target_page_data.get('meta_tags', {}).get('description', ''),
+                'main_content': target_page_data.get('main_content', ''),
+                'full_text': target_page_data.get('full_text', ''),
+                'word_count': target_page_data.get('word_count', 0),
+                'headings': target_page_data.get('headers', {}),
+                'schema_markup': target_page_data.get('schema_markup', []),
+                'internal_links_count': len(target_page_data.get('internal_links', [])),
+                'external_links_count': len(target_page_data.get('external_links', []))
+            }
+        else:
+            alignment_data['target_page'] = {'url': target_url, 'error': target_page_data.get('error')}
+        
+        # Step 6: Record competitor results in SERP order
+        for competitor, result in zip(competitor_urls, results):
+            if isinstance(result, Exception):
+                result = {
                     'serp_position': competitor['position'],
                     'url': competitor['url'],
-                    'error': f"Failed to scrape: {str(e)}"
-                })
+                    'error': f"Failed to scrape: {str(result)}"
+                }
+            alignment_data['top_10_competitors'].append(result)
         
-        # Step 6: Add summary statistics for Claude
+        # Step 7: Add summary statistics for Claude
         successful_competitors = [c for c in alignment_data['top_10_competitors'] if 'error' not in c]
         
+        # One pass accumulating every total the averages need
+        word_total = h1_total = h2_total = h3_total = 0
+        for c in successful_competitors:
+            headings = c.get('headings', {})
+            word_total += c.get('word_count', 0)
+            h1_total += len(headings.get('h1', []))
+            h2_total += len(headings.get('h2', []))
+            h3_total += len(headings.get('h3', []))
+        divisor = max(len(successful_competitors), 1)
+        
         alignment_data['dataset_summary'] = {
             'total_competitors_found': len(competitor_urls),
             'successful_scrapes': len(successful_competitors),
             'target_page_scraped': 'error' not in alignment_data['target_page'],
-            'avg_competitor_word_count': sum(c.get('word_count', 0) for c in successful_competitors) / max(len(successful_competitors), 1),
+            'avg_competitor_word_count': word_total / divisor,
             'avg_competitor_headings': {
-                'h1': sum(len(c.get('headings', {}).get('h1', [])) for c in successful_competitors) / max(len(successful_competitors), 1),
-                'h2': sum(len(c.get('headings', {}).get('h2', [])) for c in successful_competitors) / max(len(successful_competitors), 1),
-                'h3': sum(len(c.get('headings', {}).get('h3', [])) for c in successful_competitors) / max(len(successful_competitors), 1)
+                'h1': h1_total / divisor,
+                'h2': h2_total / divisor,
+                'h3': h3_total / divisor
             }
         }
         
-        return json.dumps(alignment_data, indent=2, ensure_ascii=False)
+        return dump_json(alignment_data)
         
     except Exception as e:
-        return json.dumps({
+        return dump_json({
             'error': f"SERP content alignment analysis failed: {str(e)}",
             'keyword': keyword,
             'target_url': target_url
-        }, indent=2)
+        })
 
 # Search Intent Classification Engine - Pure Data Collection  
-@mcp.tool()
-async def classify_search_intent_data(keyword: str, api_key: str = None, location: str = "United States") -> str:
-    """
-    Collect comprehensive SERP data for Claude to classify search intent
-    
-    Args:
-        keyword: Target keyword to analyze intent for
-        api_key: SerpAPI key for SERP data
-        location: Geographic location for search results
-        
-    Returns:
-        JSON string with comprehensive SERP features and result types for Claude intent analysis
-    """
+async def collect_search_intent_data(keyword: str, api_key: Optional[str], location: str) -> Dict:
+    """Intent classification data for one keyword; failures come back as an 'error' dict"""
     try:
-        # Use provided API key or fall back to environment variable
-        if api_key is None:
-            api_key = os.getenv('SERPAPI_KEY')
-        
         if not api_key:
-            return json.dumps({
+            return {
                 'error': 'SerpAPI key is required for search intent classification.',
                 'keyword': keyword
-            }, indent=2)
+            }
         
         # Get comprehensive SERP data
         params = {
@@ -1384,19 +1961,18 @@ async def classify_search_intent_data(keyword: str, api_key: str = None, locatio
             "num": 10
         }
         
-        search = GoogleSearch(params)
-        results = search.get_dict()
+        results = await scraper.serpapi_search(params)
         
         if 'error' in results:
-            return json.dumps({
+            return {
                 'error': f"SerpAPI error: {results['error']}",
                 'keyword': keyword
-            }, indent=2)
+            }
         
         # Collect intent classification data
         intent_data = {
             'keyword': keyword,
-            'analysis_date': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'analysis_date': utc_timestamp(),
             'location': location,
             'serp_features': {},
             'organic_results_analysis': [],
@@ -1405,107 +1981,40 @@ async def classify_search_intent_data(keyword: str, api_key: str = None, locatio
         }
         
         # Extract SERP features
-        serp_features = {}
-        
-        # Featured snippet/Answer box
-        if 'answer_box' in results:
-            serp_features['featured_snippet'] = {
-                'present': True,
-                'type': results['answer_box'].get('type', ''),
-                'content_type': 'informational' if 'definition' in results['answer_box'].get('type', '') else 'answer',
-                'source_domain': results['answer_box'].get('link', '').split('/')[2] if results['answer_box'].get('link') else ''
-            }
-        
-        # People Also Ask
-        if 'people_also_ask' in results:
-            serp_features['people_also_ask'] = {
-                'present': True,
-                'question_count': len(results['people_also_ask']),
-                'questions': [paa.get('question', '') for paa in results['people_also_ask'][:8]]
-            }
-        
-        # Shopping results
-        if 'shopping_results' in results:
-            serp_features['shopping_results'] = {
-                'present': True,
-                'product_count': len(results['shopping_results']),
-                'intent_signal': 'commercial/transactional'
-            }
-        
-        # Local results
-        if 'local_results' in results:
-            serp_features['local_results'] = {
-                'present': True,
-                'business_count': len(results['local_results']),
-                'intent_signal': 'local'
-            }
-        
-        # Knowledge graph
-        if 'knowledge_graph' in results:
-            serp_features['knowledge_graph'] = {
-                'present': True,
-                'type': results['knowledge_graph'].get('type', ''),
-                'intent_signal': 'informational'
-            }
-        
-        # Images
-        if 'images_results' in results:
-            serp_features['images'] = {
-                'present': True,
-                'count': len(results['images_results'])
-            }
-        
-        # Videos
-        if 'videos' in results:
-            serp_features['videos'] = {
-                'present': True,
-                'count': len(results['videos'])
-            }
-        
-        # Top stories/News
-        if 'top_stories' in results:
-            serp_features['top_stories'] = {
-                'present': True,
-                'story_count': len(results['top_stories']),
-                'intent_signal': 'informational/news'
-            }
+        serp_features = collect_serp_features(results, INTENT_SERP_FEATURES)
         
         intent_data['serp_features'] = serp_features
         
         # Analyze organic results for intent signals
         organic_results = results.get('organic_results', [])
+        organic_analysis = intent_data['organic_results_analysis']
         for i, result in enumerate(organic_results[:10]):
             if isinstance(result, dict):
                 # Analyze URL structure for intent signals
                 url = result.get('link', '')
-                domain = url.split('/')[2] if len(url.split('/')) > 2 else ''
+                domain = url_hostname(url)
                 
                 url_signals = {
-                    'has_shop_path': '/shop' in url or '/store' in url or '/buy' in url,
-                    'has_blog_path': '/blog' in url or '/articles' in url or '/news' in url,
-                    'has_how_to': 'how-to' in url or 'guide' in url or 'tutorial' in url,
-                    'is_ecommerce_domain': any(ecom in domain for ecom in ['amazon', 'ebay', 'etsy', 'shopify']),
-                    'is_informational_domain': any(info in domain for info in ['wikipedia', 'britannica', 'howstuffworks'])
+                    'has_shop_path': URL_SHOP_PATH_RE.search(url) is not None,
+                    'has_blog_path': URL_BLOG_PATH_RE.search(url) is not None,
+                    'has_how_to': URL_HOW_TO_RE.search(url) is not None,
+                    'is_ecommerce_domain': ECOMMERCE_DOMAIN_RE.search(domain) is not None,
+                    'is_informational_domain': INFORMATIONAL_DOMAIN_RE.search(domain) is not None
                 }
                 
-                title = result.get('title', '').lower()
-                snippet = result.get('snippet', '').lower()
+                title = result.get('title', '')
+                snippet = result.get('snippet', '')
                 
-                content_signals = {
-                    'title_has_how_to': 'how to' in title or 'guide' in title or 'tutorial' in title,
-                    'title_has_best': 'best' in title or 'top' in title or 'review' in title,
-                    'title_has_buy': 'buy' in title or 'price' in title or 'cost' in title,
-                    'title_has_what_is': 'what is' in title or 'definition' in title,
-                    'snippet_has_steps': 'step' in snippet or 'follow' in snippet,
-                    'snippet_has_price': 'price' in snippet or 'cost' in snippet or '$' in snippet
-                }
+                signal_hits = {TITLE_SIGNAL_TERMS[term] for term in TITLE_SIGNAL_RE.findall(title.lower())}
+                signal_hits.update(SNIPPET_SIGNAL_TERMS[term] for term in SNIPPET_SIGNAL_RE.findall(snippet.lower()))
+                content_signals = {signal: signal in signal_hits for signal in CONTENT_SIGNALS}
                 
-                intent_data['organic_results_analysis'].append({
+                organic_analysis.append({
                     'position': result.get('position', i + 1),
                     'url': url,
                     'domain': domain,
-                    'title': result.get('title', ''),
-                    'snippet': result.get('snippet', ''),
+                    'title': title,
+                    'snippet': snippet,
                     'url_signals': url_signals,
                     'content_signals': content_signals
                 })
@@ -1524,13 +2033,84 @@ async def classify_search_intent_data(keyword: str, api_key: str = None, locatio
             'query_displayed': search_info.get('query_displayed', keyword)
         }
         
-        return json.dumps(intent_data, indent=2, ensure_ascii=False)
+        return intent_data
         
     except Exception as e:
-        return json.dumps({
+        return {
             'error': f"Search intent data collection failed: {str(e)}",
             'keyword': keyword
-        }, indent=2)
+        }
+
+@mcp.tool()
+async def classify_search_intent_data(keyword: str, api_key: str = None, location: str = "United States") -> str:
+    """
+    Collect comprehensive SERP data for Claude to classify search intent
+    
+    Args:
+        keyword: Target keyword to analyze intent for
+        api_key: SerpAPI key for SERP data
+        location: Geographic location for search results
+        
+    Returns:
+        JSON string with comprehensive SERP features and result types for Claude intent analysis
+    """
+    # Use provided API key or fall back to environment variable
+    if api_key is None:
+        api_key = os.getenv('SERPAPI_KEY')
+    
+    return dump_json(await collect_search_intent_data(keyword, api_key, location))
+
+@mcp.tool()
+async def classify_search_intent_data_bulk(keywords: list, api_key: str = None, location: str = "United States") -> str:
+    """
+    Collect search intent data for many keywords at once, with the SERP lookups run concurrently
+    
+    At most 5 SerpAPI searches run at a time (SERPAPI_SEMAPHORE, shared with every other
+    SerpAPI tool), so a full batch of 50 keywords takes about ten search round-trips.
+    
+    Args:
+        keywords: Keywords to analyze intent for, at most 50 distinct ones (duplicates are analyzed
+            once; items that aren't non-empty strings are skipped and counted in skipped_items)
+        api_key: SerpAPI key for SERP data
+        location: Geographic location for search results
+        
+    Returns:
+        JSON string with one classify_search_intent_data result per keyword, in input order
+    """
+    try:
+        # Use provided API key or fall back to environment variable
+        if api_key is None:
+            api_key = os.getenv('SERPAPI_KEY')
+        
+        if not api_key:
+            return dump_json({'error': 'SerpAPI key is required for search intent classification.'})
+        
+        if not isinstance(keywords, list):
+            return dump_json({'error': 'keywords must be a list of strings.'})
+        
+        valid_keywords = [keyword for keyword in keywords if isinstance(keyword, str) and keyword.strip()]
+        unique_keywords = list(dict.fromkeys(valid_keywords))
+        if len(unique_keywords) > INTENT_BULK_MAX_KEYWORDS:
+            return dump_json({
+                'error': f"Too many keywords: {len(unique_keywords)} distinct keywords, the limit is {INTENT_BULK_MAX_KEYWORDS} per call.",
+                'total_keywords': len(unique_keywords)
+            })
+        
+        # serpapi_search caps concurrency with SERPAPI_SEMAPHORE, so the capped batch can be dispatched at once
+        results = await asyncio.gather(*[
+            collect_search_intent_data(keyword, api_key, location) for keyword in unique_keywords
+        ])
+        
+        return dump_json({
+            'location': location,
+            'total_keywords': len(unique_keywords),
+            'skipped_items': len(keywords) - len(valid_keywords),
+            'failed_keywords': sum(1 for result in results if 'error' in result),
+            'results': results
+        })
+        
+    except Exception as e:
+        return dump_json({'error': f"Bulk search intent data collection failed: {str(e)}"})
 
 # SERP Feature Opportunity Analyzer - Pure Data Collection
 @mcp.tool() 
@@ -1553,13 +2133,13 @@ async def analyze_serp_feature_opportunities(keyword: str, target_url: str, api_
             api_key = os.getenv('SERPAPI_KEY')
         
         if not api_key:
-            return json.dumps({
+            return dump_json({
                 'error': 'SerpAPI key is required for SERP feature analysis.',
                 'keyword': keyword,
                 'target_url': target_url
-            }, indent=2)
+            })
         
-        # Step 1: Get SERP data
+        # Step 1: Get SERP data while the target page is scraped
         params = {
             "q": keyword,
             "api_key": api_key,
@@ -1570,21 +2150,26 @@ async def analyze_serp_feature_opportunities(keyword: str, target_url: str, api_
             "num": 10
         }
         
-        search = GoogleSearch(params)
-        results = search.get_dict()
+        results, target_data = await asyncio.gather(
+            scraper.serpapi_search(params),
+            scraper.scrape_seo_data(target_url),
+            return_exceptions=True
+        )
+        if isinstance(results, Exception):
+            raise results
         
         if 'error' in results:
-            return json.dumps({
+            return dump_json({
                 'error': f"SerpAPI error: {results['error']}",
                 'keyword': keyword,
                 'target_url': target_url
-            }, indent=2)
+            })
         
         # Step 2: Extract current SERP features
         opportunity_data = {
             'keyword': keyword,
             'target_url': target_url,
-            'analysis_date': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'analysis_date': utc_timestamp(),
             'location': location,
             'current_serp_features': {},
             'target_page_structure': {},
@@ -1592,65 +2177,14 @@ async def analyze_serp_feature_opportunities(keyword: str, target_url: str, api_
         }
         
         # Analyze current SERP features
-        current_features = {}
-        
-        # Featured snippet
-        if 'answer_box' in results:
-            answer_box = results['answer_box']
-            current_features['featured_snippet'] = {
-                'present': True,
-                'type': answer_box.get('type', ''),
-                'current_winner': answer_box.get('link', ''),
-                'content_length': len(answer_box.get('snippet', '')),
-                'content_format': 'paragraph' if 'paragraph' in answer_box.get('type', '') else 'list'
-            }
-        else:
-            current_features['featured_snippet'] = {'present': False, 'opportunity': True}
-        
-        # People Also Ask
-        if 'people_also_ask' in results:
-            current_features['people_also_ask'] = {
-                'present': True,
-                'question_count': len(results['people_also_ask']),
-                'questions': [paa.get('question', '') for paa in results['people_also_ask'][:5]]
-            }
-        else:
-            current_features['people_also_ask'] = {'present': False, 'opportunity': True}
-        
-        # Knowledge graph
-        if 'knowledge_graph' in results:
-            current_features['knowledge_graph'] = {
-                'present': True,
-                'type': results['knowledge_graph'].get('type', ''),
-                'current_winner': results['knowledge_graph'].get('source', {}).get('link', '')
-            }
-        
-        # Shopping results
-        if 'shopping_results' in results:
-            current_features['shopping_results'] = {
-                'present': True,
-                'product_count': len(results['shopping_results'])
-            }
-        
-        # Images
-        if 'images_results' in results:
-            current_features['images'] = {
-                'present': True,
-                'image_count': len(results['images_results'])
-            }
-        
-        # Videos
-        if 'videos' in results:
-            current_features['videos'] = {
-                'present': True,
-                'video_count': len(results['videos'])
-            }
+        current_features = collect_serp_features(results, OPPORTUNITY_SERP_FEATURES)
         
         opportunity_data['current_serp_features'] = current_features
         
         # Step 3: Analyze target page structure
         try:
-            target_data = await scraper.scrape_seo_data(target_url)
+            if isinstance(target_data, Exception):
+                raise target_data
             
             if 'error' not in target_data:
                 # Analyze content structure for SERP feature eligibility
@@ -1659,40 +2193,57 @@ async def analyze_serp_feature_opportunities(keyword: str, target_url: str, api_
                 schema_markup = target_data.get('schema_markup', [])
                 
                 # Content format analysis
+                question_count = main_content.count('?')
                 content_structure = {
                     'word_count': target_data.get('word_count', 0),
-                    'has_questions': '?' in main_content,
-                    'question_count': main_content.count('?'),
-                    'has_numbered_lists': bool(re.search(r'\d+\.', main_content)),
-                    'has_bullet_points': '•' in main_content or '*' in main_content,
-                    'has_tables': '<table' in str(target_data.get('full_text', '')),
-                    'paragraph_count': len([p for p in main_content.split('\n\n') if p.strip()]),
-                    'has_step_by_step': any(word in main_content.lower() for word in ['step 1', 'first step', 'step by step'])
+                    'has_questions': question_count > 0,
+                    'question_count': question_count,
+                    'has_numbered_lists': NUMBERED_LIST_RE.search(main_content) is not None,
+                    'has_bullet_points': BULLET_RE.search(main_content) is not None,
+                    'has_tables': target_data.get('has_table', False),
+                    'paragraph_count': target_data.get('paragraph_count', 0),
+                    'has_step_by_step': STEP_BY_STEP_RE.search(main_content) is not None
                 }
                 
-                # Heading analysis
+                # Heading analysis: one pass over H2/H3 lowercases each heading once
+                h1 = headers.get('h1', [])
+                h2 = headers.get('h2', [])
+                h3 = headers.get('h3', [])
+                has_faq_headings = False
+                heading_as_questions = 0
+                for h in h2 + h3:
+                    lowered = h.lower()
+                    if 'faq' in lowered or 'question' in lowered:
+                        has_faq_headings = True
+                    if h.endswith('?'):
+                        heading_as_questions += 1
+                
                 heading_structure = {
-                    'h1_count': len(headers.get('h1', [])),
-                    'h2_count': len(headers.get('h2', [])),
-                    'h3_count': len(headers.get('h3', [])),
-                    'has_faq_headings': any('faq' in h.lower() or 'question' in h.lower() for h in headers.get('h2', []) + headers.get('h3', [])),
-                    'has_how_to_headings': any('how to' in h.lower() for h in headers.get('h1', []) + headers.get('h2', [])),
-                    'heading_as_questions': sum(1 for h in headers.get('h2', []) + headers.get('h3', []) if h.endswith('?'))
+                    'h1_count': len(h1),
+                    'h2_count': len(h2),
+                    'h3_count': len(h3),
+                    'has_faq_headings': has_faq_headings,
+                    'has_how_to_headings': any('how to' in h.lower() for h in h1 + h2),
+                    'heading_as_questions': heading_as_questions
                 }
                 
-                # Schema markup analysis
-                schema_types = []
+                # Schema markup analysis; @type may be a single type or a list of types
+                schema_types = set()
                 for schema in schema_markup:
-                    if isinstance(schema, dict):
-                        if '@type' in schema:
-                            schema_types.append(schema['@type'])
-                        elif '@graph' in schema:
-                            for item in schema['@graph']:
-                                if isinstance(item, dict) and '@type' in item:
-                                    schema_types.append(item['@type'])
+                    if not isinstance(schema, dict):
+                        continue
+                    items = [schema] if '@type' in schema else schema.get('@graph', [])
+                    for item in items:
+                        if not isinstance(item, dict):
+                            continue
+                        item_type = item.get('@type')
+                        if isinstance(item_type, str):
+                            schema_types.add(item_type)
+                        elif isinstance(item_type, list):
+                            schema_types.update(t for t in item_type if isinstance(t, str))
                 
                 schema_analysis = {
-                    'schema_types_present': list(set(schema_types)),
+                    'schema_types_present': sorted(schema_types),
                     'has_article_schema': 'Article' in schema_types or 'BlogPosting' in schema_types,
                     'has_faq_schema': 'FAQPage' in schema_types,
                     'has_howto_schema': 'HowTo' in schema_types,
@@ -1713,14 +2264,14 @@ async def analyze_serp_feature_opportunities(keyword: str, target_url: str, api_
         except Exception as e:
             opportunity_data['target_page_structure'] = {'error': f"Failed to analyze page structure: {str(e)}"}
         
-        return json.dumps(opportunity_data, indent=2, ensure_ascii=False)
+        return dump_json(opportunity_data)
         
     except Exception as e:
-        return json.dumps({
+        return dump_json({
             'error': f"SERP feature opportunity analysis failed: {str(e)}",
             'keyword': keyword,
             'target_url': target_url
-        }, indent=2)
+        })
 
 # NEW: INTEGRATED KEYWORDS EVERYWHERE TOOLS
 @mcp.tool()
@@ -1729,20 +2280,20 @@ async def keyword_research_analysis(keywords: list, country: str = "US", api_key
     Get comprehensive keyword research data including search volume, CPC, competition, and difficulty
     
     Args:
-        keywords: List of keywords to analyze (max 1000 per request)
+        keywords: List of keywords to analyze (any length; sent to the API in concurrent batches of 100)
         country: Country code for search data (US, UK, DE, etc.)
         api_key: Keywords Everywhere API key (optional, uses environment variable if not provided)
         
     Returns:
-        JSON string with keyword research analysis including opportunity scoring and recommendations
+        JSON string with keyword research analysis including opportunity scoring and the top 50 recommended targets
     """
     try:
         # Use provided API key or update scraper's key
         if api_key:
-            scraper.ke_api = KeywordsEverywhereAPI(api_key)
+            scraper.ke_api = ke_api_for_key(api_key)
         
         # Get keyword data from Keywords Everywhere
-        data = await scraper.ke_api.get_search_volume(keywords, country)
+        data = await scraper.ke_api.get_search_volume_bulk(keywords, country)
         
         # Format the response for SEO analysis
         analysis_result = {
@@ -1788,7 +2339,7 @@ async def keyword_research_analysis(keywords: list, country: str = "US", api_key
             if volume >= 1000:
                 analysis_result["summary"]["high_volume_keywords"].append(keyword_info["keyword"])
             
-            if competition in ["Low", "Medium"] and volume >= 100:
+            if competition in LOW_MEDIUM_COMPETITION and volume >= 100:
                 analysis_result["summary"]["low_competition_opportunities"].append(keyword_info["keyword"])
             
             if cpc >= 1.0:
@@ -1802,18 +2353,18 @@ async def keyword_research_analysis(keywords: list, country: str = "US", api_key
                     "cpc": cpc
                 })
         
-        # Sort recommended targets by opportunity score
-        analysis_result["summary"]["recommended_targets"].sort(
-            key=lambda x: x["score"], reverse=True
+        # Keep the top recommended targets by opportunity score (partial selection, no full sort)
+        analysis_result["summary"]["recommended_targets"] = heapq.nlargest(
+            MAX_RECOMMENDED_TARGETS, analysis_result["summary"]["recommended_targets"], key=lambda x: x["score"]
         )
         
-        return json.dumps(analysis_result, indent=2, ensure_ascii=False)
+        return dump_json(analysis_result)
         
     except Exception as e:
-        return json.dumps({
+        return dump_json({
             'error': f"Keyword research analysis failed: {str(e)}",
             'keywords_requested': len(keywords) if keywords else 0
-        }, indent=2)
+        })
 
 @mcp.tool()
 async def related_keywords_discovery(keyword: str, country: str = "US", api_key: str = None) -> str:
@@ -1831,7 +2382,7 @@ async def related_keywords_discovery(keyword: str, country: str = "US", api_key:
     try:
         # Use provided API key or update scraper's key
         if api_key:
-            scraper.ke_api = KeywordsEverywhereAPI(api_key)
+            scraper.ke_api = ke_api_for_key(api_key)
         
         # Get related keywords
         data = await scraper.ke_api.get_related_keywords(keyword, country)
@@ -1894,16 +2445,16 @@ async def related_keywords_discovery(keyword: str, country: str = "US", api_key:
                 "keywords": [kw["keyword"] for kw in commercial_kws[:10]]
             })
         
-        return json.dumps(discovery_result, indent=2, ensure_ascii=False)
+        return dump_json(discovery_result)
         
     except Exception as e:
-        return json.dumps({
+        return dump_json({
             'error': f"Related keywords discovery failed: {str(e)}",
             'seed_keyword': keyword
-        }, indent=2)
+        })
 
 @mcp.tool()
-async def keyword_opportunity_scorer(keywords: list, country: str = "US", business_relevance_keywords: list = None, api_key: str = None) -> str:
+async def keyword_opportunity_scorer(keywords: list, country: str = "US", business_relevance_keywords: list = None, api_key: str = None, top_n: int = None) -> str:
     """
     Analyze keyword opportunities by combining volume, difficulty, and commercial value
     
@@ -1912,6 +2463,7 @@ async def keyword_opportunity_scorer(keywords: list, country: str = "US", busine
         country: Country code for search data
         business_relevance_keywords: Keywords that indicate high business relevance (optional)
         api_key: Keywords Everywhere API key (optional, uses environment variable if not provided)
+        top_n: Only return the N highest-scoring keywords in scored_keywords (optional, default all)
         
     Returns:
         JSON string with prioritized keyword opportunities and strategic recommendations
@@ -1919,12 +2471,14 @@ async def keyword_opportunity_scorer(keywords: list, country: str = "US", busine
     try:
         # Use provided API key or update scraper's key
         if api_key:
-            scraper.ke_api = KeywordsEverywhereAPI(api_key)
+            scraper.ke_api = ke_api_for_key(api_key)
         
         business_keywords = business_relevance_keywords or []
+        # Lowercased once up front; one C-level alternation search per keyword replaces M substring scans
+        business_re = re.compile('|'.join(re.escape(bkw.lower()) for bkw in business_keywords)) if business_keywords else None
         
         # Get keyword data
-        data = await scraper.ke_api.get_search_volume(keywords, country)
+        data = await scraper.ke_api.get_search_volume_bulk(keywords, country)
         
         scoring_result = {
             "tool": "Keywords Everywhere - Opportunity Scorer",
@@ -1950,14 +2504,10 @@ async def keyword_opportunity_scorer(keywords: list, country: str = "US", busine
             volume_score = min(volume / 500, 10) if volume else 0
             cpc_score = min(cpc * 3, 10) if cpc else 0
             
-            competition_multiplier = {
-                "Low": 1.0,
-                "Medium": 0.7,
-                "High": 0.4
-            }.get(competition, 0.5)
+            competition_multiplier = COMPETITION_MULTIPLIERS.get(competition, 0.5)
             
             # Business relevance bonus
-            relevance_bonus = 1.3 if any(bkw.lower() in keyword.lower() for bkw in business_keywords) else 1.0
+            relevance_bonus = 1.3 if business_re is not None and business_re.search(keyword.lower()) else 1.0
             
             opportunity_score = ((volume_score * 0.4 + cpc_score * 0.6) * competition_multiplier * relevance_bonus)
             
@@ -1991,19 +2541,118 @@ async def keyword_opportunity_scorer(keywords: list, country: str = "US", busine
             
             scoring_result["scored_keywords"].append(scored_keyword)
         
-        # Sort by opportunity score
-        scoring_result["scored_keywords"].sort(key=lambda x: x["opportunity_score"], reverse=True)
+        # Sort by opportunity score; a requested top N only needs a partial selection
+        if top_n:
+            scoring_result["scored_keywords"] = heapq.nlargest(top_n, scoring_result["scored_keywords"], key=lambda x: x["opportunity_score"])
+        else:
+            scoring_result["scored_keywords"].sort(key=lambda x: x["opportunity_score"], reverse=True)
         
-        return json.dumps(scoring_result, indent=2, ensure_ascii=False)
+        return dump_json(scoring_result)
         
     except Exception as e:
-        return json.dumps({
+        return dump_json({
             'error': f"Keyword opportunity scoring failed: {str(e)}",
             'keywords_requested': len(keywords) if keywords else 0
-        }, indent=2)
+        })
+
+async def fetch_gap_data(current_keywords: list, seed_topics: list, country: str) -> Dict:
+    """Gap keywords for the seed topics plus their KE metrics; API failures come back as {'error': message}"""
+    try:
+        # Get related keywords for every seed topic at once
+        related_payloads = await asyncio.gather(
+            *(scraper.ke_api.get_related_keywords(topic, country) for topic in seed_topics),
+            return_exceptions=True
+        )
+        all_related_keywords = []
+        failed_topics = []
+        for topic, related_data in zip(seed_topics, related_payloads):
+            if isinstance(related_data, Exception):
+                # One failed topic shouldn't sink the whole gap analysis, but it is reported
+                failed_topics.append({"topic": topic, "error": str(related_data)})
+                continue
+            for kw_data in related_data.get("data", []):
+                all_related_keywords.append(kw_data.get("keyword", ""))
+        
+        if failed_topics and len(failed_topics) == len(related_payloads):
+            return {
+                'error': f"Competitor keyword gap analysis failed: related keyword lookups failed for every seed topic ({failed_topics[0]['error']})",
+                'failed_topics': failed_topics
+            }
+        
+        # Find gaps (keywords not in current list), each once even if several topics return it
+        current_kw_set = {kw.lower() for kw in current_keywords}
+        seen_gaps = set()
+        gap_keywords = []
+        for kw in all_related_keywords:
+            kw_lower = kw.lower()
+            if kw_lower in current_kw_set or kw_lower in seen_gaps:
+                continue
+            seen_gaps.add(kw_lower)
+            gap_keywords.append(kw)
+        
+        # Get data for gap keywords
+        gap_data = await scraper.ke_api.get_search_volume(gap_keywords[:100], country) if gap_keywords else {}  # Limit to 100
+        return {"gap_keywords": gap_keywords, "gap_data": gap_data, "failed_topics": failed_topics}
+        
+    except Exception as e:
+        return {'error': f"Competitor keyword gap analysis failed: {str(e)}"}
+
+def build_gap_info(gap_kw: Dict) -> Dict:
+    """One prioritized gap row from a Keywords Everywhere keyword record"""
+    volume = gap_kw.get("vol", 0) or 0
+    competition = gap_kw.get("competition", "Unknown")
+    
+    # Priority scoring for gaps
+    if volume >= 1000 and competition in LOW_MEDIUM_COMPETITION:
+        gap_priority = "High"
+    elif volume >= 100:
+        gap_priority = "Medium"
+    else:
+        gap_priority = "Low"
+    
+    return {
+        "keyword": gap_kw.get("keyword", ""),
+        "search_volume": volume,
+        # FIXED: Extract CPC using helper function
+        "cpc": extract_cpc_value(gap_kw.get("cpc")),
+        "competition": competition,
+        "gap_priority": gap_priority
+    }
+
+def format_gap_result(current_keywords_count: int, gap_keywords: List[str], gap_data: Dict) -> Dict:
+    """Prioritize fetched gap keywords and build the content recommendations"""
+    rows = gap_data.get("data", [])
+    gap_result = {
+        "tool": "Keywords Everywhere - Competitor Gap Analysis",
+        "current_keywords_count": current_keywords_count,
+        "gap_opportunities_found": len(gap_keywords),
+        "analyzed_gaps": len(rows),
+        "keyword_gaps": [build_gap_info(gap_kw) for gap_kw in rows],
+        "high_opportunity_gaps": [],
+        "content_gap_recommendations": []
+    }
+    
+    # Sort by volume once; the high-priority subset inherits the order (the sort is stable)
+    gap_result["keyword_gaps"].sort(key=lambda x: x["search_volume"], reverse=True)
+    gap_result["high_opportunity_gaps"] = [gap for gap in gap_result["keyword_gaps"] if gap["gap_priority"] == "High"]
+    
+    # Content recommendations
+    if gap_result["high_opportunity_gaps"]:
+        target_keywords = []
+        estimated_monthly_volume = 0
+        for gap in gap_result["high_opportunity_gaps"][:5]:
+            target_keywords.append(gap["keyword"])
+            estimated_monthly_volume += gap["search_volume"]
+        gap_result["content_gap_recommendations"].append({
+            "recommendation": "Create high-priority content pages",
+            "target_keywords": target_keywords,
+            "estimated_monthly_volume": estimated_monthly_volume
+        })
+    
+    return gap_result
 
 @mcp.tool()
-async def competitor_keyword_gap_analysis(current_keywords: list, seed_topics: list, country: str = "US", api_key: str = None) -> str:
+async def competitor_keyword_gap_analysis(current_keywords: list, seed_topics: list, country: str = "US", api_key: str = None, pretty: bool = True) -> str:
     """
     Analyze keyword gaps by comparing your current GSC keywords with related keyword opportunities
     
@@ -2012,96 +2661,52 @@ async def competitor_keyword_gap_analysis(current_keywords: list, seed_topics: l
         seed_topics: Main topic areas to explore for gaps
         country: Country code for search data
         api_key: Keywords Everywhere API key (optional, uses environment variable if not provided)
+        pretty: Indent the JSON output (set False for compact output, roughly 40% smaller for large gap lists)
         
     Returns:
         JSON string with keyword gap analysis and content recommendations
     """
-    try:
-        # Use provided API key or update scraper's key
-        if api_key:
-            scraper.ke_api = KeywordsEverywhereAPI(api_key)
-        
-        # Get related keywords for each seed topic
-        all_related_keywords = []
-        for topic in seed_topics:
-            related_data = await scraper.ke_api.get_related_keywords(topic, country)
-            for kw_data in related_data.get("data", []):
-                all_related_keywords.append(kw_data.get("keyword", ""))
-        
-        # Find gaps (keywords not in current list)
-        current_kw_set = set([kw.lower() for kw in current_keywords])
-        gap_keywords = [kw for kw in all_related_keywords if kw.lower() not in current_kw_set]
-        
-        # Get data for gap keywords
-        if gap_keywords:
-            gap_data = await scraper.ke_api.get_search_volume(gap_keywords[:100], country)  # Limit to 100
-            
-            gap_result = {
-                "tool": "Keywords Everywhere - Competitor Gap Analysis",
-                "current_keywords_count": len(current_keywords),
-                "gap_opportunities_found": len(gap_keywords),
-                "analyzed_gaps": len(gap_data.get("data", [])),
-                "keyword_gaps": [],
-                "high_opportunity_gaps": [],
-                "content_gap_recommendations": []
-            }
-            
-            for gap_kw in gap_data.get("data", []):
-                keyword = gap_kw.get("keyword", "")
-                volume = gap_kw.get("vol", 0) or 0
-                # FIXED: Extract CPC using helper function
-                cpc = extract_cpc_value(gap_kw.get("cpc"))
-                competition = gap_kw.get("competition", "Unknown")
-                
-                gap_info = {
-                    "keyword": keyword,
-                    "search_volume": volume,
-                    "cpc": cpc,
-                    "competition": competition,
-                    "gap_priority": "Low"
-                }
-                
-                # Priority scoring for gaps
-                if volume >= 1000 and competition in ["Low", "Medium"]:
-                    gap_info["gap_priority"] = "High"
-                    gap_result["high_opportunity_gaps"].append(gap_info)
-                elif volume >= 100:
-                    gap_info["gap_priority"] = "Medium"
-                
-                gap_result["keyword_gaps"].append(gap_info)
-            
-            # Sort by volume
-            gap_result["keyword_gaps"].sort(key=lambda x: x["search_volume"], reverse=True)
-            gap_result["high_opportunity_gaps"].sort(key=lambda x: x["search_volume"], reverse=True)
-            
-            # Content recommendations
-            if gap_result["high_opportunity_gaps"]:
-                gap_result["content_gap_recommendations"].append({
-                    "recommendation": "Create high-priority content pages",
-                    "target_keywords": [kw["keyword"] for kw in gap_result["high_opportunity_gaps"][:5]],
-                    "estimated_monthly_volume": sum([kw["search_volume"] for kw in gap_result["high_opportunity_gaps"][:5]])
-                })
-            
-            return json.dumps(gap_result, indent=2, ensure_ascii=False)
-        else:
-            return json.dumps({
-                "tool": "Keywords Everywhere - Competitor Gap Analysis",
-                "message": "No significant keyword gaps found",
-                "current_keywords_count": len(current_keywords)
-            }, indent=2)
-        
-    except Exception as e:
-        return json.dumps({
-            'error': f"Competitor keyword gap analysis failed: {str(e)}",
-            'current_keywords_count': len(current_keywords) if current_keywords else 0,
-            'seed_topics': seed_topics
-        }, indent=2)
+    # Use provided API key or update scraper's key
+    if api_key:
+        scraper.ke_api = ke_api_for_key(api_key)
+    
+    n_current = len(current_keywords) if current_keywords else 0
+    
+    # Only the API calls are guarded; formatting the fetched rows is plain dict work
+    fetched = await fetch_gap_data(current_keywords, seed_topics, country)
+    if 'error' in fetched:
+        fetched.update(current_keywords_count=n_current, seed_topics=seed_topics)
+        return dump_json(fetched, pretty)
+    
+    # Nothing to prioritize when there are no gaps or KE returned no rows for them
+    if not fetched["gap_keywords"] or not fetched["gap_data"].get("data"):
+        gap_result = {
+            "tool": "Keywords Everywhere - Competitor Gap Analysis",
+            "message": "No significant keyword gaps found",
+            "current_keywords_count": n_current
+        }
+    else:
+        gap_result = format_gap_result(n_current, fetched["gap_keywords"], fetched["gap_data"])
+    
+    # Topics whose related-keyword lookup failed weren't analyzed for gaps
+    if fetched["failed_topics"]:
+        gap_result["failed_topics"] = fetched["failed_topics"]
+    
+    return dump_json(gap_result, pretty)
 
 # Cleanup function
 async def cleanup():
     """Clean up browser and session resources on shutdown"""
     await scraper.close_resources()
 
+async def serve():
+    """Run the stdio MCP server, then clean up on the same event loop the resources were created on"""
+    try:
+        await mcp.run_stdio_async()
+    finally:
+        print("Cleaning up...", file=sys.stderr)
+        await cleanup()
+
 # NEW: Keywords Everywhere API Test Tool
 @mcp.tool()
 async def test_keywords_everywhere_api(api_key: str = None) -> str:
@@ -2117,89 +2722,97 @@ async def test_keywords_everywhere_api(api_key: str = None) -> str:
     try:
         # Use provided API key or update scraper's key
         if api_key:
-            test_api = KeywordsEverywhereAPI(api_key)
+            test_api = ke_api_for_key(api_key)
         else:
             test_api = scraper.ke_api
         
         # Test the API connection
         test_result = await test_api.test_api_connection()
-        return json.dumps(test_result, indent=2, ensure_ascii=False)
+        return dump_json(test_result)
         
     except Exception as e:
-        return json.dumps({
+        return dump_json({
             'error': f"API test failed: {str(e)}",
             'setup_instructions': [
                 '1. Get your Keywords Everywhere API key from https://keywordseverywhere.com',
                 '2. Create a .env file with KEYWORDS_EVERYWHERE_API_KEY=your_key_here',
                 '3. Or pass the API key directly to this tool'
             ]
-        }, indent=2)
+        })
+
+# Startup banner, written to stderr (stdout carries the MCP JSON protocol)
+BANNER_LINES = (
+    "Starting Complete Integrated SEO MCP Server...",
+    "COMBINED: Technical SEO Analysis + SERP Intelligence + Keyword Research",
+    "\nAvailable tools:",
+    "\nTECHNICAL SEO ANALYSIS:",
+    "- scrape_seo_data: Raw SEO data extraction",
+    "- collect_server_headers: Server response headers analysis",
+    "- analyze_redirect_chain: Technical redirect analysis",
+    "- validate_structured_data: Schema.org validation",
+    "- detect_javascript_rendering: JavaScript rendering detection",
+    "- page_speed_metrics: Core Web Vitals and performance data",
+    "- full_page_audit: Scrape, headers, redirects and page speed in one concurrent pass",
+    "\nSERP INTELLIGENCE:",
+    "- serp_data_collector: SERP data collection via SerpAPI",
+    "- analyze_serp_content_alignment: Content vs competitor analysis",
+    "- classify_search_intent_data: Search intent classification",
+    "- classify_search_intent_data_bulk: Search intent data for a keyword list",
+    "- analyze_serp_feature_opportunities: SERP feature opportunities",
+    "\nKEYWORD RESEARCH (Keywords Everywhere):",
+    "- keyword_research_analysis: Volume, CPC, competition analysis",
+    "- related_keywords_discovery: Related keyword discovery",
+    "- keyword_opportunity_scorer: Strategic opportunity scoring",
+    "- competitor_keyword_gap_analysis: Keyword gap analysis",
+    "\nINTEGRATION BENEFITS:",
+    "- One unified MCP server for complete SEO analysis",
+    "- Seamless workflow from keyword discovery to technical optimization",
+    "- Enterprise-level insights at fraction of the cost",
+    "- Perfect for on-page SEO specialists following data-first approach",
+    "\nServer ready and waiting for Claude connections..."
+)
+
+def print_banner():
+    """Write the startup banner to stderr in a single write"""
+    sys.stderr.write("\n".join(BANNER_LINES) + "\n")
 
 if __name__ == "__main__":
-    import sys
-    
     # Send informational output to stderr instead of stdout to avoid MCP JSON parsing errors
-    print("Starting Complete Integrated SEO MCP Server...", file=sys.stderr)
-    print("COMBINED: Technical SEO Analysis + SERP Intelligence + Keyword Research", file=sys.stderr)
-    print("\nAvailable tools:", file=sys.stderr)
-    print("\nTECHNICAL SEO ANALYSIS:", file=sys.stderr)
-    print("- scrape_seo_data: Raw SEO data extraction", file=sys.stderr)
-    print("- collect_server_headers: Server response headers analysis", file=sys.stderr)
-    print("- analyze_redirect_chain: Technical redirect analysis", file=sys.stderr)
-    print("- validate_structured_data: Schema.org validation", file=sys.stderr)
-    print("- detect_javascript_rendering: JavaScript rendering detection", file=sys.stderr)
-    print("- page_speed_metrics: Core Web Vitals and performance data", file=sys.stderr)
-    print("\nSERP INTELLIGENCE:", file=sys.stderr)
-    print("- serp_data_collector: SERP data collection via SerpAPI", file=sys.stderr)
-    print("- analyze_serp_content_alignment: Content vs competitor analysis", file=sys.stderr)
-    print("- classify_search_intent_data: Search intent classification", file=sys.stderr)
-    print("- analyze_serp_feature_opportunities: SERP feature opportunities", file=sys.stderr)
-    print("\nKEYWORD RESEARCH (Keywords Everywhere):", file=sys.stderr)
-    print("- keyword_research_analysis: Volume, CPC, competition analysis", file=sys.stderr)
-    print("- related_keywords_discovery: Related keyword discovery", file=sys.stderr)
-    print("- keyword_opportunity_scorer: Strategic opportunity scoring", file=sys.stderr)
-    print("- competitor_keyword_gap_analysis: Keyword gap analysis", file=sys.stderr)
-    print("\nINTEGRATION BENEFITS:", file=sys.stderr)
-    print("- One unified MCP server for complete SEO analysis", file=sys.stderr)
-    print("- Seamless workflow from keyword discovery to technical optimization", file=sys.stderr)
-    print("- Enterprise-level insights at fraction of the cost", file=sys.stderr)
-    print("- Perfect for on-page SEO specialists following data-first approach", file=sys.stderr)
-    print("\nServer ready and waiting for Claude connections...", file=sys.stderr)
-    
-    # Test CPC parsing fix with sample Keywords Everywhere API data (send to stderr)
-    print("\n=== CPC Parsing Fix Verification ===", file=sys.stderr)
-    sample_api_response = {
-        "data": [
-            {
-                "vol": 1220000,
-                "cpc": {"currency": "$", "value": "0.09"},
-                "competition": 0,
-                "keyword": "test"
-            },
-            {
-                "vol": 50000,
-                "cpc": {"currency": "$", "value": "1.25"},
-                "competition": 0.3,
-                "keyword": "test keyword"
-            }
-        ]
-    }
+    print_banner()
     
-    print("Testing CPC extraction with sample API data:", file=sys.stderr)
-    for item in sample_api_response["data"]:
-        extracted_cpc = extract_cpc_value(item.get("cpc"))
-        print(f"Keyword: {item['keyword']}", file=sys.stderr)
-        print(f"Original CPC: {item['cpc']}", file=sys.stderr)
-        print(f"Extracted CPC: {extracted_cpc} (type: {type(extracted_cpc)})", file=sys.stderr)
-        print(f"Math test (CPC * 2): {extracted_cpc * 2}", file=sys.stderr)
-        print("---", file=sys.stderr)
-    print("✅ CPC parsing fix verified - no more TypeError with dict * int", file=sys.stderr)
-    print("=====================================\n", file=sys.stderr)
+    # Opt-in CPC parsing self-check against sample Keywords Everywhere API data (send to stderr)
+    if os.environ.get("SEO_MCP_SELFTEST") == "1":
+        sample_api_response = {
+            "data": [
+                {
+                    "vol": 1220000,
+                    "cpc": {"currency": "$", "value": "0.09"},
+                    "competition": 0,
+                    "keyword": "test"
+                },
+                {
+                    "vol": 50000,
+                    "cpc": {"currency": "$", "value": "1.25"},
+                    "competition": 0.3,
+                    "keyword": "test keyword"
+                }
+            ]
+        }
+        
+        cpc_report = ["\n=== CPC Parsing Fix Verification ===\n", "Testing CPC extraction with sample API data:\n"]
+        for item in sample_api_response["data"]:
+            extracted_cpc = extract_cpc_value(item.get("cpc"))
+            cpc_report += [
+                f"Keyword: {item['keyword']}\n",
+                f"Original CPC: {item['cpc']}\n",
+                f"Extracted CPC: {extracted_cpc} (type: {type(extracted_cpc)})\n",
+                f"Math test (CPC * 2): {extracted_cpc * 2}\n",
+                "---\n"
+            ]
+        cpc_report += ["✅ CPC parsing fix verified - no more TypeError with dict * int\n", "=====================================\n\n"]
+        sys.stderr.writelines(cpc_report)
     
     try:
-        mcp.run()
+        asyncio.run(serve())
     except KeyboardInterrupt:
-        print("Server stopped by user", file=sys.stderr)
-    finally:
-        print("Cleaning up...", file=sys.stderr)
-        asyncio.run(cleanup())
\ No newline at end of file
+        print("Server stopped by user", file=sys.stderr)
\ No newline at end of file